@@ -0,0 +1,127 @@
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, astuple
+
+from flask import Flask, Response, jsonify, request
+
+from cache import get_cache
+from fall_ceiling import CANNOT_CALCULATE, parse_rooms, result_record
+from series import calculate_ceiling_summary
+from units import UNITS
+
+MAX_BATCH_ROOMS = 100000
+POOL_CHUNK_SIZE = 2000
+# rod lists grow with the walls, so one absurd wall would tie up a worker,
+# and a batch of large rooms would lay out hundreds of millions of rods
+MAX_ROOM_FEET = 5000
+MAX_BATCH_FEET = 10_000_000
+# a summary takes the same time for any size, so only overflow is a concern
+MAX_SUMMARY_FEET = 1_000_000
+
+def _too_large(dimensions, limit: float = MAX_ROOM_FEET) -> bool:
+    return dimensions is not None and any(abs(value) > limit for value in astuple(dimensions))
+
+def _calculate_chunk(rooms: list) -> list[dict]:
+    from batch import calculate_rooms_batch
+
+    return [
+        values if values is not None else {'error': CANNOT_CALCULATE}
+        for values in calculate_rooms_batch(rooms).to_dicts()
+    ]
+
+def _warm_up() -> None:
+    import batch  # noqa: F401 -- load NumPy in each worker before the first request
+
+def _start_pool(workers: int) -> ProcessPoolExecutor:
+    pool = ProcessPoolExecutor(max_workers=workers)
+    for future in [pool.submit(_warm_up) for _ in range(workers)]:
+        future.result()
+    atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+def create_app(workers: int = None) -> Flask:
+    app = Flask(__name__)
+    workers = workers if workers is not None else os.cpu_count() or 1
+    pool = _start_pool(workers) if workers > 1 else None
+    cache = get_cache()
+    if os.environ.get('CEILING_METRICS') == '1':
+        import metrics
+        metrics.enable()
+
+    def bad_request(message: str):
+        return jsonify({'error': message}), 400
+
+    @app.post('/calculate')
+    def calculate():
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return bad_request("expected a JSON object with length1, length2, width1, width2, linter_spacing and unit")
+        if payload.get('unit', 'ft') not in UNITS:
+            return bad_request(f"unit must be one of {', '.join(UNITS)}")
+        summary = payload.get('summary', False)
+        if not isinstance(summary, bool):
+            return bad_request("summary must be true or false")
+
+        passthrough, dimensions = next(parse_rooms([{key: value for key, value in payload.items() if key != 'summary'}], 'ft'))
+        if dimensions is None:
+            return bad_request(passthrough['error'])
+        if _too_large(dimensions, MAX_SUMMARY_FEET if summary else MAX_ROOM_FEET):
+            if summary:
+                return bad_request(f"dimensions must be at most {MAX_SUMMARY_FEET} ft")
+            return bad_request(f"dimensions must be at most {MAX_ROOM_FEET} ft; ask for \"summary\": true for larger rooms")
+
+        try:
+            result = calculate_ceiling_summary(dimensions) if summary else cache.get_or_calculate(dimensions)
+        except (ArithmeticError, IndexError, ValueError):
+            return jsonify({'error': CANNOT_CALCULATE}), 422
+        return jsonify(result_record(result))
+
+    @app.post('/calculate/batch')
+    def calculate_batch():
+        payload = request.get_json(silent=True)
+        records = payload.get('rooms') if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            return bad_request("expected {\"rooms\": [...]} or a JSON list of rooms")
+        if len(records) > MAX_BATCH_ROOMS:
+            return bad_request(f"at most {MAX_BATCH_ROOMS} rooms per batch")
+        if not all(isinstance(record, dict) for record in records):
+            return bad_request("every room must be a JSON object")
+
+        unit = payload.get('unit', 'ft') if isinstance(payload, dict) else 'ft'
+        if unit not in UNITS:
+            return bad_request(f"unit must be one of {', '.join(UNITS)}")
+
+        parsed = list(parse_rooms(records, unit))
+        too_large = [index for index, (_, dimensions) in enumerate(parsed) if _too_large(dimensions)]
+        if too_large:
+            return bad_request(f"dimensions must be at most {MAX_ROOM_FEET} ft (room {too_large[0]})")
+        if sum(max(abs(room.length1), abs(room.length2)) + abs(room.width1) for _, room in parsed if room is not None) > MAX_BATCH_FEET:
+            return bad_request(f"at most {MAX_BATCH_FEET} ft of walls per batch; split the rooms into smaller batches")
+        rooms = [dimensions for _, dimensions in parsed if dimensions is not None]
+        chunks = [rooms[start:start + POOL_CHUNK_SIZE] for start in range(0, len(rooms), POOL_CHUNK_SIZE)]
+        if pool is not None and len(chunks) > 1:
+            calculated = [result for chunk in pool.map(_calculate_chunk, chunks) for result in chunk]
+        else:
+            calculated = [result for chunk in chunks for result in _calculate_chunk(chunk)]
+
+        results = []
+        calculated = iter(calculated)
+        for passthrough, dimensions in parsed:
+            results.append({**passthrough, **next(calculated)} if dimensions is not None else passthrough)
+        return jsonify({'results': results})
+
+    @app.get('/health')
+    def health():
+        stats = cache.stats()
+        return jsonify({'status': 'ok', 'workers': workers, 'cache': {**asdict(stats), 'hit_rate': stats.hit_rate}})
+
+    @app.get('/metrics')
+    def prometheus_metrics():
+        import metrics
+        return Response(metrics.prometheus_text(), mimetype='text/plain; version=0.0.4')
+
+    return app
+
+if __name__ == '__main__':
+    create_app().run(host='127.0.0.1', port=int(os.environ.get('PORT', 5000)), threaded=True)
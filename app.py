@@ -1,232 +1,319 @@
+import os
 import streamlit as st
-import pandas as pd
+from functools import partial
 from math import ceil
-from decimal import Decimal
-import base64
 from io import BytesIO
-from utils import RoomDimensions, calculate_ceiling_requirements
-from translations import HINGLISH_TRANSLATIONS as TR
-
-def convert_to_feet(value, unit):
-    conversion = {
-        'ft': 1.0,
-        'mm': 0.00328084,
-        'cm': 0.0328084,
-        'inches': 0.0833333,
-        'm': 3.28084,
-        'yd': 3
-    }
-    return value * conversion[unit]
-
-def generate_excel_download(calc_results):
-    df = pd.DataFrame({
-        'Item': [
-            'Parameters (Full 12ft)',
-            'Parameters (Extra Length)',
-            'Main Rods',
-            'Cross Rods',
-            'Connecting Clips',
-            'Screws',
-            'Total Parameter Length'
-        ],
-        'Quantity': [
-            calc_results.parameters_full,
-            f"{calc_results.parameters_extra:.2f} ft",
-            calc_results.main_rods,
-            calc_results.cross_rods,
-            calc_results.connecting_clips,
-            calc_results.screws,
-            f"{calc_results.total_parameter_length:.2f} ft"
-        ]
-    })
-    
+from utils import RoomDimensions
+from units import UNITS, convert_to_feet
+from cache import configure_cache
+from translations import ENGLISH_TRANSLATIONS, HINGLISH_TRANSLATIONS
+
+TRANSLATIONS = {'English': ENGLISH_TRANSLATIONS, 'Hinglish': HINGLISH_TRANSLATIONS}
+OTHER_LANGUAGE = {'English': 'Hinglish', 'Hinglish': 'English'}
+
+# CEILING_METRICS=1 times every calculation stage and shows the sidebar panel
+METRICS_ENABLED = os.environ.get('CEILING_METRICS') == '1'
+
+RESULT_CACHE_SIZE = 4096
+RESULT_CACHE_TTL = 24 * 60 * 60
+
+# project reports run on a shared background queue; finished reports are
+# kept for an hour so a rerun or a second tab picks them up again
+JOB_WORKERS = 2
+JOB_ARTIFACT_TTL = 60 * 60
+JOB_POLL_SECONDS = 1
+JOB_LABELS = {
+    'project': 'Bill of materials',
+    'project_workbook': 'Excel report',
+    'cutting_plan': 'Cutting plan',
+}
+
+@st.cache_resource
+def get_result_cache():
+    return configure_cache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+@st.cache_resource
+def get_job_queue():
+    from jobs import JobQueue
+
+    return JobQueue(workers=JOB_WORKERS, ttl=JOB_ARTIFACT_TTL)
+
+# pandas, NumPy and xlsxwriter are only needed once someone exports or opens
+# project mode, so they are imported there instead of on every cold start
+
+def get_session_graph():
+    # per browser session, so editing one field only redoes the stages that
+    # depend on it; the shared cache still answers exact repeats first
+    from graph import CalculationGraph
+
+    if 'graph' not in st.session_state:
+        st.session_state.graph = CalculationGraph()
+    return st.session_state.graph
+
+def generate_excel_download(calc_results, board_sheets=None):
+    from export import write_workbook
+
     buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Ceiling Calculation')
-    
+    write_workbook(buffer, [(('Room 1',), calc_results, board_sheets)])
     return buffer.getvalue()
 
-def convert_to_hinglish():
-    st.title(TR['calculator_title'])
-    unit = st.selectbox(TR['select_unit'], ['ft', 'mm', 'cm', 'inches', 'm', 'yd'])
-    linter_spacing = st.number_input(f"{TR['linter_spacing']} ({unit})", min_value=0.0)
-    st.subheader(TR['room_measurements'])
+def room_form(tr):
+    if 'calculator_title' in tr:
+        st.title(tr['calculator_title'])
+
+    unit = st.selectbox(tr['select_unit'], UNITS)
+    linter_spacing = st.number_input(
+        f"{tr['linter_spacing']} ({unit})",
+        min_value=0.0,
+        help=tr['linter_spacing_help']
+    )
+
+    st.subheader(tr['room_measurements'])
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        length1 = st.number_input(f'{TR["wall1_length"]} ({unit})', min_value=0.0)
-        width1 = st.number_input(f'{TR["wall1_width"]} ({unit})', min_value=0.0)
-    
+        length1 = st.number_input(f"{tr['wall1_length']} ({unit})", min_value=0.0)
+        width1 = st.number_input(f"{tr['wall1_width']} ({unit})", min_value=0.0)
+
     with col2:
-        length2 = st.number_input(f'{TR["wall2_length"]} ({unit})', min_value=0.0)
-        width2 = st.number_input(f'{TR["wall2_width"]} ({unit})', min_value=0.0)
-
-    if st.button(TR['calculate_button']):
-        dimensions = RoomDimensions(
-            convert_to_feet(length1, unit),
-            convert_to_feet(length2, unit),
-            convert_to_feet(width1, unit),
-            convert_to_feet(width2, unit),
-            convert_to_feet(linter_spacing, unit)
-        )
-        
-        results = calculate_ceiling_requirements(dimensions)
-        
-        st.subheader(TR['calculation_results'])
-        
-        st.write(TR['parameters_title'])
-        st.write(f"{TR['total_parameter_length']}: {results.total_parameter_length:.2f} ft")
-        st.write(f"{TR['full_parameters']}: {results.parameters_full}")
-        if results.parameters_extra > 0:
-            st.write(f"{TR['extra_parameter_length']}: {results.parameters_extra:.2f} ft ({TR['overlap']})")
-        
-        st.write(TR['main_rods_title'])
-        st.write(f"{TR['number_of_main_rods']}: {len(results.main_lengths)}")
-        if results.extra_main_needed:
-            extra_length = float(results.extra_main_needed.split()[0])
-            extra_rods = ceil(extra_length / 12)
-            st.write(f"{TR['extra_main_rods_needed']}: {extra_rods}")
-            st.write(f"{TR['total_main_rods_needed']}: {len(results.main_lengths) + extra_rods}")
-        st.write(TR['main_rods_details'])
-        st.write(f"- {TR['first_rod']}: 2ft")
-        st.write(f"- {TR['spacing_between_rods']}: 4ft")
-        for i, length in enumerate(results.main_lengths):
-            st.write(f"- {TR['main_rod']} {i+1}: {length:.2f} ft")
-        st.write(f"- {TR['last_main_length']}: {results.last_main_length:.2f} ft")
-        
-        st.write(TR['cross_rods_title'])
-        st.write(f"{TR['number_of_cross_rods']}: {results.cross_rods}")
-        st.write(TR['cross_rods_details'])
-        st.write(f"- {TR['first_rod']}: 2ft")
-        st.write(f"- {TR['spacing_between_rods']}: 2ft")
-        for i, length in enumerate(results.cross_lengths):
-            st.write(f"- {TR['cross_rod']} {i+1}: {length:.2f} ft")
-        st.write(f"- {TR['last_cross_length']}: {results.last_cross_length:.2f} ft")
-        
-        st.write(TR['support_materials_title'])
-        st.write(f"{TR['full_l_patti_count']}: {results.full_l_patti_count}")
-        st.write(f"{TR['cutting_l_patti']}: {results.l_patti_cuts} ({TR['cut_size']}: {results.l_patti_cut_size:.2f}ft/{TR['piece']})")
-        st.write(f"{TR['remaining_cutted_l_patti']}: {results.l_patti_remaining} ({results.l_patti_cut_size:.2f}ft/{TR['piece']})")
-        st.write(f"{TR['fasteners_needed']}: {results.fasteners} ({TR['per_l_patti']})")
-        st.write(f"{TR['fastener_clips_needed']}: {results.fastener_clips} ({TR['per_fastener']})")
-        st.write(f"{TR['nut_bolt_pair_needed']}: {results.fastener_clips} ({TR['per_fastener_clip']})")
-        st.write(f"{TR['connecting_clips_needed']}: {results.connecting_clips} ({TR['at_main_cross_intersections']})")
-        
-        st.write(TR['screws_title'])
-        st.write(f"{TR['regular_screws']}: {results.screws} ({TR['spacing_on_parameters']})")
-        st.write(f"{TR['black_screws']}: {results.black_screws} {TR['box']} ({TR['per_1000_sqft']})")
-        
-        st.write(TR['plywood_boards_title'])
-        if results.board_extra_sqft > 0:
-            st.write(f"{TR['full_boards_needed']}: {int(results.board_count)}")
-            st.write(f"{TR['extra_area_needed']}: {results.board_extra_sqft:.2f} sqft ({results.board_extra_sqft/24:.2f} {TR['boards']})")
+        length2 = st.number_input(f"{tr['wall2_length']} ({unit})", min_value=0.0)
+        width2 = st.number_input(f"{tr['wall2_width']} ({unit})", min_value=0.0)
+
+    if not st.button(tr['calculate']):
+        return None
+
+    return RoomDimensions(
+        convert_to_feet(length1, unit),
+        convert_to_feet(length2, unit),
+        convert_to_feet(width1, unit),
+        convert_to_feet(width2, unit),
+        convert_to_feet(linter_spacing, unit)
+    )
+
+def board_layout(dimensions):
+    from boards import plan_boards
+
+    try:
+        return plan_boards(dimensions)
+    except ValueError:
+        return None
+
+def render_results(results, tr, layout=None):
+    # every st.* call is a separate delta to the browser, so each section is
+    # one markdown block and the per-rod lengths go out as a single table
+    main_count = len(results.main_lengths)
+    rods = [f"### {tr['parameters']}",
+            f"{tr['total_length']}: {results.total_parameter_length:.2f} ft",
+            f"{tr['full_parameters']}: {results.parameters_full}"]
+    if results.parameters_extra > 0:
+        rods.append(f"{tr['extra_length']}: {results.parameters_extra:.2f} ft ({tr['overlap']})")
+
+    rods += [f"### {tr['main_rods']}", f"{tr['rod_count']}: {main_count}"]
+    if results.extra_main_needed:
+        extra_rods = ceil(float(results.extra_main_needed.split()[0]) / 12)
+        rods += [f"{tr['extra_needed']}: {extra_rods}", f"{tr['total_needed']}: {main_count + extra_rods}"]
+    rods += [f"{tr['rod_details']}:\n"
+             f"- {tr['first_rod']}\n"
+             f"- {tr['spacing']}: 4ft\n"
+             f"- {tr['last_length']}: {results.last_main_length:.2f} ft"]
+    if results.extra_main_needed:
+        rods.append(f"{tr['extra_main_needed']}: {results.extra_main_needed}")
+
+    rods += [f"### {tr['cross_rods']}",
+             f"{tr['cross_count']}: {results.cross_rods}",
+             f"{tr['cross_details']}:\n"
+             f"- {tr['first_rod']}\n"
+             f"- {tr['cross_spacing']}\n"
+             f"- {tr['last_cross_length']}: {results.last_cross_length:.2f} ft"]
+
+    materials = [f"### {tr['support_materials']}",
+                 f"- {tr['l_patti_count']}: {results.full_l_patti_count}\n"
+                 f"- {tr['cutting_l_patti']}: {results.l_patti_cuts} ({tr['cut_size']}: {results.l_patti_cut_size:.2f}ft/{tr['piece']})\n"
+                 f"- {tr['remaining_l_patti']}: {results.l_patti_remaining} ({results.l_patti_cut_size:.2f}ft/{tr['piece']})\n"
+                 f"- {tr['fasteners']}: {results.fasteners} ({tr['per_l_patti']})\n"
+                 f"- {tr['fastener_clips']}: {results.fastener_clips} ({tr['per_fastener']})\n"
+                 f"- {tr['nut_bolt']}: {results.fastener_clips} ({tr['per_fastener_clip']})\n"
+                 f"- {tr['connecting_clips']}: {results.connecting_clips} ({tr['at_intersections']})",
+                 f"### {tr['screws']}",
+                 f"- {tr['regular_screws']}: {results.screws} ({tr['screw_spacing']})\n"
+                 f"- {tr['black_screws']}: {results.black_screws} {tr['box']} ({tr['per_1000_sqft']})",
+                 f"### {tr['plywood']}",
+                 f"{tr['full_boards']}: {int(results.board_count)}"]
+    if results.board_extra_sqft > 0:
+        materials.append(f"{tr['extra_area']}: {results.board_extra_sqft:.2f} sqft ({results.board_extra_sqft/24:.2f} {tr['boards']})")
+    if layout is not None:
+        materials.append(f"{tr['board_layout']}: {layout.sheet_count} ({tr['layout_waste']}: {layout.waste_sqft:.2f} sqft)")
+
+    st.subheader(tr['calculation_results'])
+    st.markdown('\n\n'.join(rods))
+    with st.expander(tr['rod_table']):
+        st.dataframe({
+            tr['rod']: [tr['main']] * main_count + [tr['cross']] * len(results.cross_lengths),
+            tr['rod_number']: list(range(1, main_count + 1)) + list(range(1, len(results.cross_lengths) + 1)),
+            tr['length_ft']: [round(length, 2) for length in results.main_lengths] + [round(length, 2) for length in results.cross_lengths]
+        })
+    st.markdown('\n\n'.join(materials))
+
+    st.download_button(
+        tr['download_excel'],
+        partial(generate_excel_download, results, layout.sheet_count if layout is not None else None),
+        file_name='ceiling_calculation.xlsx',
+        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+
+def project_mode():
+    st.subheader('Project (Floors → Flats → Rooms)')
+    unit = st.selectbox('Unit for rows without a unit column:', UNITS, key='project_unit')
+    upload = st.file_uploader(
+        'Project file (CSV or Excel)',
+        type=['csv', 'xlsx'],
+        help="Columns: floor, flat, room, length1, length2, width1, width2, linter_spacing, unit"
+    )
+
+    optimise = st.checkbox('Optimise cutting of 12ft rods and 8ft L-patti across rooms')
+    board_layouts = st.checkbox('Count boards from a sheet layout of each room (slower for large projects)')
+
+    if upload is None:
+        st.session_state.pop('project_jobs', None)
+    elif st.button('Calculate Project'):
+        from project import load_project
+
+        try:
+            rooms = load_project(upload, unit)
+        except ValueError as error:
+            st.error(str(error))
+            return
+
+        # identical uploads share one job, so clicking again never queues a second run
+        queue = get_job_queue()
+        jobs = {
+            'project': queue.submit('project', rooms, board_layouts),
+            'project_workbook': queue.submit('project_workbook', rooms, board_layouts),
+        }
+        if optimise:
+            jobs['cutting_plan'] = queue.submit('cutting_plan', rooms)
+        st.session_state.project_jobs = jobs
+        st.session_state.project_board_layouts = board_layouts
+
+    jobs = st.session_state.get('project_jobs')
+    if not jobs:
+        return
+    try:
+        statuses = {name: get_job_queue().status(job_id) for name, job_id in jobs.items()}
+    except KeyError:
+        del st.session_state.project_jobs
+        st.info('These results have expired; calculate the project again.')
+        return
+
+    if all(status.done for status in statuses.values()):
+        render_project(statuses)
+    else:
+        project_progress()
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def project_progress():
+    # only this fragment reruns while the jobs work; the whole page reruns
+    # once to show the results
+    queue = get_job_queue()
+    jobs = st.session_state.get('project_jobs', {})
+    try:
+        statuses = {name: queue.status(job_id) for name, job_id in jobs.items()}
+    except KeyError:
+        st.rerun()
+    if all(status.done for status in statuses.values()):
+        st.rerun()
+
+    for name, status in statuses.items():
+        label = JOB_LABELS[name]
+        if status.state == 'queued':
+            st.progress(0.0, f"{label}: waiting for a worker")
         else:
-            st.write(f"{TR['full_boards_needed']}: {int(results.board_count)}")
+            st.progress(status.progress, f"{label}: {status.message or status.state}")
+
+def render_project(statuses):
+    import pandas as pd
+
+    queue = get_job_queue()
+    for name, status in statuses.items():
+        if status.state != 'done':
+            st.error(f"{JOB_LABELS[name]} failed: {status.error or status.state}")
+
+    if statuses['project'].state == 'done':
+        result = queue.result(statuses['project'].id)
+        st.subheader('Bill of Materials')
+        rows = {floor or '-': vars(bom) for floor, bom in result.floors.items()}
+        rows['Total'] = vars(result.total)
+        st.dataframe(pd.DataFrame.from_dict(rows, orient='index'))
+        source = 'from the sheet layout' if st.session_state.get('project_board_layouts') else 'area estimate, room by room'
+        st.write(f"Total boards ({source}): {result.total.boards_total} (whole project by area {result.total.boards_by_area})")
+
+    if 'cutting_plan' in statuses and statuses['cutting_plan'].state == 'done':
+        plans = queue.result(statuses['cutting_plan'].id)
+        st.subheader('Optimised Stock')
+        st.dataframe(pd.DataFrame.from_dict({
+            name: {
+                'Stock Length (ft)': plan.stock_length,
+                'Stock Needed': plan.stock_count,
+                'Lower Bound': plan.lower_bound,
+                'Waste (ft)': plan.waste,
+                'Waste (%)': round(plan.waste_percent, 2),
+            }
+            for name, plan in plans.items()
+        }, orient='index'))
+
+    if statuses['project'].state == 'done' and result.invalid_rooms:
+        st.warning(f"{len(result.invalid_rooms)} room(s) skipped: width1 must be over 2 ft and linter spacing between 0 and 8 ft")
+
+    if statuses['project_workbook'].state == 'done':
+        st.download_button(
+            'Download Excel (BOM, rooms and cut list)',
+            queue.result(statuses['project_workbook'].id),
+            file_name='ceiling_project.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+
+def metrics_sidebar():
+    import metrics
+
+    snapshot = metrics.snapshot()
+    cache = snapshot['cache']
+    with st.sidebar:
+        st.subheader('Performance')
+        st.dataframe({
+            'Stage': [f"{stage['engine']}.{stage['stage']}" for stage in snapshot['stages']],
+            'Calls': [stage['calls'] for stage in snapshot['stages']],
+            'Mean (ms)': [round(1000 * stage['mean_seconds'], 3) for stage in snapshot['stages']],
+            'Max (ms)': [round(1000 * stage['max_seconds'], 3) for stage in snapshot['stages']],
+            'Lengths': [stage['lengths'] for stage in snapshot['stages']],
+        }, hide_index=True)
+        st.write(f"Cache: {cache['hits']} hits, {cache['misses']} misses ({100 * cache['hit_rate']:.1f}%), {cache['size']}/{cache['maxsize']} entries")
 
 def main():
     st.set_page_config(page_title='Ceiling Design Calculator')
+    if METRICS_ENABLED:
+        import metrics
+        metrics.enable()
+
     st.title('Ceiling Design Calculator')
-    
+
     if 'language' not in st.session_state:
         st.session_state.language = 'English'
-    
-    if st.session_state.language == 'English':
-        if st.button('Convert to Hinglish'):
-            st.session_state.language = 'Hinglish'
-            st.rerun()
-    else:
-        if st.button('Convert to English'):
-            st.session_state.language = 'English'
-            st.rerun()
-    
-    if st.session_state.language == 'Hinglish':
-        convert_to_hinglish()
+    tr = TRANSLATIONS[st.session_state.language]
+
+    if st.button(tr['switch_language']):
+        st.session_state.language = OTHER_LANGUAGE[st.session_state.language]
+        st.rerun()
+
+    mode = st.radio('Mode', ['Single Room', 'Project'])
+    if mode == 'Project':
+        project_mode()
     else:
-        unit = st.selectbox(
-            'Select measurement unit:',
-            ['ft', 'mm', 'cm', 'inches', 'm', 'yd']
-        )
-        
-        linter_spacing = st.number_input(
-            f'Linter Spacing ({unit})',
-            min_value=0.0,
-            help="Distance from Roof/Linter to the Main/Enter"
-        )
-        
-        st.subheader('Room Measurements')
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            length1 = st.number_input(f'Wall 1 Length ({unit})', min_value=0.0)
-            width1 = st.number_input(f'Wall 1 Width ({unit})', min_value=0.0)
-        
-        with col2:
-            length2 = st.number_input(f'Wall 2 Length ({unit})', min_value=0.0)
-            width2 = st.number_input(f'Wall 2 Width ({unit})', min_value=0.0)
-
-        if st.button('Calculate'):
-            dimensions = RoomDimensions(
-                convert_to_feet(length1, unit),
-                convert_to_feet(length2, unit),
-                convert_to_feet(width1, unit),
-                convert_to_feet(width2, unit),
-                convert_to_feet(linter_spacing, unit)
-            )
-            
-            results = calculate_ceiling_requirements(dimensions)
-            
-            st.subheader('Calculation Results')
-            
-            st.write("### Parameters (1 inch × 1 inch Steel Rods)")
-            st.write(f"Total Perimeter Length: {results.total_parameter_length:.2f} ft")
-            st.write(f"Full Parameters (12ft each): {results.parameters_full}")
-            if results.parameters_extra > 0:
-                st.write(f"Extra Parameter Length: {results.parameters_extra:.2f} ft (with 4 inch overlap)")
-            
-            st.write("### Main/Enter Rods (1 inch × 2 inch)")
-            st.write(f"Number of Main Rods: {len(results.main_lengths)}")
-            if results.extra_main_needed:
-                extra_length = float(results.extra_main_needed.split()[0])
-                extra_rods = ceil(extra_length / 12)
-                st.write(f"Need Main Rod for Extra: {extra_rods}")
-                st.write(f"Total Main Rod Needed: {len(results.main_lengths) + extra_rods}")
-            st.write(f"Main Rod Details:")
-            st.write("- First rod: 2ft from wall")
-            st.write("- Spacing between rods: 4ft")
-            for i, length in enumerate(results.main_lengths):
-                st.write(f"- Main {i+1}: {length:.2f} ft")
-            st.write(f"- Last Main Length: {results.last_main_length:.2f} ft")
-            if results.extra_main_needed:
-                st.write(f"Extra Main Needed: {results.extra_main_needed}")
-            
-            st.write("### Cross Rods (3 inch × 1 inch)")
-            st.write(f"Number of Cross Rods: {results.cross_rods}")
-            st.write("Cross Rod Details:")
-            st.write("- First rod: 2ft from wall")
-            st.write("- Spacing: 2ft between rods")
-            for i, length in enumerate(results.cross_lengths):
-                st.write(f"- Cross {i+1}: {length:.2f} ft")
-            st.write(f"- Last Cross Length: {results.last_cross_length:.2f} ft")
-            
-            st.write("### Support Materials")
-            st.write(f"Full L-Patti Count (8ft): {results.full_l_patti_count}")
-            st.write(f"Cutting L-Patti: {results.l_patti_cuts} (Cut Size: {results.l_patti_cut_size:.2f}ft/piece)")
-            st.write(f"Remaining Cutted L-Patti: {results.l_patti_remaining} ({results.l_patti_cut_size:.2f}ft/piece)")
-            st.write(f"Fasteners needed: {results.fasteners} (1 per L-patti)")
-            st.write(f"Fastener clips needed: {results.fastener_clips} (1 per fastener)")
-            st.write(f"Nut Bolt Pair needed: {results.fastener_clips} (1 per Fastener Clip)")
-            st.write(f"Connecting clips needed: {results.connecting_clips} (at Main-Cross intersections)")
-            
-            st.write("### Screws")
-            st.write(f"Regular screws: {results.screws} (1ft spacing on parameters)")
-            st.write(f"Black screws: {results.black_screws} Box(es) (1 Box per 1000 sqft)")
-            
-            st.write("### Plywood Boards (6ft × 4ft x 0.5inch)")
-            if results.board_extra_sqft > 0:
-                st.write(f"Full boards needed: {int(results.board_count)}")
-                st.write(f"Extra area needed: {results.board_extra_sqft:.2f} sqft ({results.board_extra_sqft/24:.2f} boards)")
-            else:
-                st.write(f"Full boards needed: {int(results.board_count)}")
+        dimensions = room_form(tr)
+        if dimensions is not None:
+            render_results(get_result_cache().get_or_calculate(dimensions, get_session_graph().calculate), tr, board_layout(dimensions))
+
+    if METRICS_ENABLED:
+        metrics_sidebar()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
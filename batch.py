@@ -0,0 +1,405 @@
+from dataclasses import dataclass, fields
+from typing import Sequence, Union
+
+import numpy as np
+
+from catalog import CATALOG_FIELDS, DEFAULT_CATALOG, MaterialCatalog
+from fixed import FOOT, calculate_ceiling_requirements as calculate_fixed, catalog_ticks
+from units import to_ticks
+from utils import CeilingCalculation, RoomDimensions
+
+# The fixed engine on NumPy columns: every size is a whole number of ticks and
+# every comparison and count is int64 arithmetic, so a batch equals
+# utils.calculate_ceiling_requirements bit for bit. Rooms too large for int64,
+# which is only halls of thousands of feet, are handed to fixed one by one.
+
+@dataclass
+class BatchCalculation:
+    parameters_full: np.ndarray
+    parameters_extra: np.ndarray
+    main_rods: np.ndarray
+    cross_rods: np.ndarray
+    connecting_clips: np.ndarray
+    screws: np.ndarray
+    total_parameter_length: np.ndarray
+    main_rods_length: np.ndarray
+    cross_rods_length: np.ndarray
+    l_patti_count: np.ndarray
+    black_screws: np.ndarray
+    fasteners: np.ndarray
+    fastener_clips: np.ndarray
+    board_count: np.ndarray
+    board_extra_sqft: np.ndarray
+    full_l_patti_count: np.ndarray
+    l_patti_cuts: np.ndarray
+    l_patti_remaining: np.ndarray
+    l_patti_cut_size: np.ndarray
+    last_cross_length: np.ndarray
+    cross_lengths: np.ndarray
+    main_lengths: np.ndarray
+    last_main_length: np.ndarray
+    extra_main_needed: np.ndarray
+    cross_offsets: np.ndarray
+    main_offsets: np.ndarray
+    valid: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def room_main_lengths(self, index: int) -> np.ndarray:
+        return self.main_lengths[self.main_offsets[index]:self.main_offsets[index + 1]]
+
+    def room_cross_lengths(self, index: int) -> np.ndarray:
+        return self.cross_lengths[self.cross_offsets[index]:self.cross_offsets[index + 1]]
+
+    def to_calculation(self, index: int) -> CeilingCalculation:
+        if not self.valid[index]:
+            raise ValueError(f"Room {index} has dimensions the calculator cannot handle")
+
+        values = {}
+        for item in fields(CeilingCalculation):
+            if item.name == 'main_lengths':
+                values[item.name] = self.room_main_lengths(index).tolist()
+            elif item.name == 'cross_lengths':
+                values[item.name] = self.room_cross_lengths(index).tolist()
+            elif item.name == 'extra_main_needed':
+                extra = float(self.extra_main_needed[index])
+                values[item.name] = f"{extra:.2f} FT" if extra > 0 else ""
+            else:
+                values[item.name] = getattr(self, item.name)[index].item()
+        return CeilingCalculation(**values)
+
+    def to_dicts(self) -> list:
+        # column-wise tolist() is far cheaper than building rooms one by one;
+        # rooms the calculator rejects come back as None
+        columns = []
+        for item in fields(CeilingCalculation):
+            if item.name in ('main_lengths', 'cross_lengths'):
+                flat = getattr(self, item.name).tolist()
+                offsets = getattr(self, item.name.replace('_lengths', '_offsets')).tolist()
+                columns.append([flat[start:end] for start, end in zip(offsets, offsets[1:])])
+            elif item.name == 'extra_main_needed':
+                columns.append([f"{extra:.2f} FT" if extra > 0 else "" for extra in self.extra_main_needed.tolist()])
+            elif item.type is float:
+                columns.append(getattr(self, item.name).astype(np.float64).tolist())
+            else:
+                columns.append(getattr(self, item.name).tolist())
+
+        names = [item.name for item in fields(CeilingCalculation)]
+        return [dict(zip(names, values)) if ok else None for ok, values in zip(self.valid.tolist(), zip(*columns))]
+
+def round2(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100.0
+    rounded = np.rint(scaled)
+
+    # only values within a hair of a half-cent can round differently from
+    # Python's round(), which rounds half-even on the exact binary value
+    near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    if len(near_half):
+        exact = values[near_half]
+        product = scaled[near_half]
+
+        # Dekker's exact product: exact * 100 == product + error
+        split = exact * 134217729.0
+        high = split - (split - exact)
+        low = exact - high
+        error = (high * 100.0 - product) + low * 100.0
+
+        whole = np.floor(product)
+        offset = ((product - whole) - 0.5) + error
+        odd = np.fmod(whole, 2.0) != 0
+        rounded[near_half] = whole + ((offset > 0) | ((offset == 0) & odd))
+
+    result = rounded / 100.0
+    result = np.where(result == 0, np.copysign(0.0, values), result)
+    return np.where(np.abs(values) < 1e13, result, values)
+
+def _ticks(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # to_ticks on a column, and which values fit the int64 path. A product
+    # well clear of half a tick rounds the same in floating point as the typed
+    # decimal does; anything else goes through to_ticks itself.
+    with np.errstate(invalid='ignore', over='ignore'):
+        scaled = values * FOOT
+        rounded = np.rint(scaled)
+        near = (np.abs(scaled - rounded) < 0.25) & (np.abs(scaled) < 2.0 ** 50)
+    ticks = np.where(near, rounded, 0).astype(np.int64)
+    fits = near.copy()
+    for index in np.flatnonzero(~near):
+        try:
+            value = to_ticks(values[index])
+        except (ArithmeticError, ValueError):
+            continue
+        if abs(value) < 2 ** 50:
+            ticks[index] = value
+            fits[index] = True
+    return ticks, fits
+
+def _catalog_ticks(catalog: Union[MaterialCatalog, Sequence[MaterialCatalog]], rooms: int) -> dict:
+    if isinstance(catalog, MaterialCatalog):
+        ticks = catalog_ticks(catalog)
+        return {name: np.int64(getattr(ticks, name)) for name in CATALOG_FIELDS}
+    if len(catalog) != rooms:
+        raise ValueError("give one catalog, or one catalog per room")
+    ticks = [catalog_ticks(item) for item in catalog]
+    return {name: np.array([getattr(item, name) for item in ticks], dtype=np.int64) for name in CATALOG_FIELDS}
+
+def _select(catalog: dict, rows: np.ndarray) -> dict:
+    return {name: value[rows] if isinstance(value, np.ndarray) else value for name, value in catalog.items()}
+
+def _ragged_layout(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    rows = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(offsets[-1]) - offsets[:-1][rows]
+    return offsets, rows, local
+
+def _ragged_total(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    # the running total may wrap around int64 over many rooms, but each
+    # room's difference is exact as long as the room's own total fits
+    with np.errstate(over='ignore'):
+        running = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+        return running[offsets[1:]] - running[offsets[:-1]]
+
+def _round2(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # fixed._round2 on columns: the exact quotient to hundredths, half to even
+    hundredths, remainder = np.divmod(100 * numerator, denominator)
+    up = (2 * remainder > denominator) | ((2 * remainder == denominator) & (hundredths % 2 == 1))
+    return (hundredths + up) / 100
+
+def _in_units(length1, length2, width1, width2, linter_spacing, catalog: dict) -> tuple[list, dict, np.ndarray, np.ndarray]:
+    # each room in the largest unit dividing all of its sizes, the catalog's
+    # and the foot: 1/300 ft for sizes typed in feet to two decimals
+    unit = np.gcd.reduce([np.gcd.reduce(list(catalog.values())) * np.ones_like(length1), np.full_like(length1, FOOT),
+                          length1, length2, width1, width2, linter_spacing])
+    walls = [column // unit for column in (length1, length2, width1, width2, linter_spacing)]
+    sizes = {name: value // unit for name, value in catalog.items()}
+    foot = FOOT // unit
+
+    # a rod scaled by its wall is a product of two sizes; summed over a
+    # room's rods and taken to hundredths it must stay inside int64, and one
+    # rod must convert to float exactly
+    largest = np.max([np.abs(column) for column in walls] + [np.broadcast_to(value, unit.shape) for value in sizes.values()] + [foot], axis=0).astype(np.float64)
+    spacing = np.minimum(sizes['main_spacing'], sizes['cross_spacing'])
+    rods = 2 * largest / np.maximum(spacing, 1) + 4
+    fits = (largest * largest * (300 * rods + 4000) < 2.0 ** 62) & (3 * largest * largest < 2.0 ** 53)
+    return walls, sizes, foot, fits
+
+def _calculate_parameters(total_perimeter, catalog: dict, foot):
+    STANDARD_LENGTH = catalog['parameter_length']
+    OVERLAP = catalog['parameter_overlap']
+
+    full_rods = -(-total_perimeter // STANDARD_LENGTH)
+    extra_length = np.where(total_perimeter > full_rods * STANDARD_LENGTH, total_perimeter - full_rods * STANDARD_LENGTH, 0)
+    extra_length = np.where(extra_length > STANDARD_LENGTH, extra_length + OVERLAP, extra_length)
+
+    return full_rods, _round2(extra_length, foot)
+
+def _calculate_main_rods(length1, length2, width1, catalog: dict):
+    FIRST_DISTANCE = catalog['first_rod_distance']
+    SPACING = catalog['main_spacing']
+    STANDARD_LENGTH = catalog['rod_length']
+    WALL_THRESHOLD = catalog['main_wall_threshold']
+    OVERLAP = catalog['main_overlap']
+
+    # range(FIRST_DISTANCE, width1, SPACING), then the rod by the wall
+    spaced = -((FIRST_DISTANCE - width1) // SPACING)
+    last_spaced = FIRST_DISTANCE + SPACING * (spaced - 1)
+    wall_rod = (width1 - last_spaced) >= WALL_THRESHOLD
+    counts = spaced + wall_rod
+
+    offsets, rows, local = _ragged_layout(counts)
+    positions = FIRST_DISTANCE[rows] + SPACING[rows] * local
+    is_wall_rod = local == spaced[rows]
+    positions[is_wall_rod] = np.minimum(width1, last_spaced + SPACING)[rows[is_wall_rod]]
+
+    # scaled by width1, as in fixed
+    main_lengths = length1[rows] * width1[rows] + (length2[rows] - length1[rows]) * positions
+
+    standard = (STANDARD_LENGTH * width1)[rows]
+    over = main_lengths > standard
+    extra_length = np.where(over, main_lengths - standard, 0)
+    additional_rods = np.where(over, -(-extra_length // standard), 0)
+
+    extra_rods_needed = _ragged_total(additional_rods, offsets)
+    total_extra_needed = _ragged_total(extra_length, offsets) + extra_rods_needed * OVERLAP * width1
+
+    return counts + extra_rods_needed, main_lengths, offsets, total_extra_needed
+
+def _calculate_cross_rods(length1, length2, width1, width2, catalog: dict):
+    FIRST_DISTANCE = catalog['first_rod_distance']
+    SPACING = catalog['cross_spacing']
+    MIN_THRESHOLD = catalog['cross_min_threshold']
+    MAX_THRESHOLD = catalog['cross_max_threshold']
+    STANDARD_LENGTH = catalog['rod_length']
+
+    longer_wall = np.maximum(length1, length2)
+
+    # range(FIRST_DISTANCE, longer_wall + 1, SPACING), less or plus one
+    counts = np.where(longer_wall >= FIRST_DISTANCE, (longer_wall - FIRST_DISTANCE) // SPACING + 1, 0)
+    last_position = FIRST_DISTANCE + SPACING * (counts - 1)
+    counts = np.where((counts > 0) & ((longer_wall - last_position) <= MIN_THRESHOLD), counts - 1, counts)
+    last_position = FIRST_DISTANCE + SPACING * (counts - 1)
+    counts = np.where((counts > 0) & ((longer_wall - last_position) > MAX_THRESHOLD), counts + 1, counts)
+
+    offsets, rows, local = _ragged_layout(counts)
+    positions = FIRST_DISTANCE[rows] + SPACING[rows] * local
+    # scaled by longer_wall, as in fixed
+    cross_lengths = width1[rows] * longer_wall[rows] + (width2[rows] - width1[rows]) * positions
+
+    has_rods = counts > 0
+    scale = np.where(has_rods, longer_wall, 1)
+    total_cross_length = _ragged_total(cross_lengths, offsets)
+    last_cross_length = cross_lengths[np.maximum(offsets[1:] - 1, 0)] if len(cross_lengths) else np.zeros(len(counts), dtype=np.int64)
+    num_cross_rods = np.where(has_rods, -(-total_cross_length // np.where(has_rods, STANDARD_LENGTH * longer_wall, 1)), 0)
+
+    return num_cross_rods, cross_lengths, offsets, scale, has_rods, total_cross_length, last_cross_length
+
+def _calculate_l_patti(linter_spacing, width1, main_lengths, main_offsets, catalog: dict):
+    L_PATTI_LENGTH = catalog['l_patti_length']
+    FIRST_L_PATTI = catalog['first_l_patti']
+    SPACING = catalog['l_patti_spacing']
+    END_CLEARANCE = catalog['l_patti_end_clearance']
+
+    rows = np.repeat(np.arange(len(main_offsets) - 1), np.diff(main_offsets))
+    reach = ((FIRST_L_PATTI + END_CLEARANCE) * width1)[rows]
+    spacing = (SPACING * width1)[rows]
+    per_main = np.where(main_lengths >= reach, (main_lengths - reach) // spacing + 1, 0)
+    total_l_patti_cuts = _ragged_total(per_main, main_offsets)
+
+    pieces_per_l_patti = L_PATTI_LENGTH // linter_spacing
+    full_l_patti_needed = -(-total_l_patti_cuts // pieces_per_l_patti)
+    remaining_pieces = full_l_patti_needed * pieces_per_l_patti - total_l_patti_cuts
+
+    return full_l_patti_needed, total_l_patti_cuts, remaining_pieces
+
+def _calculate_board_requirements(room_area, catalog: dict, foot):
+    BOARD_AREA = 4 * catalog['board_length'] * catalog['board_width']
+
+    full_boards = room_area // BOARD_AREA
+    extra_sqft = _round2(room_area - full_boards * BOARD_AREA, 4 * foot * foot)
+
+    return full_boards, extra_sqft
+
+def _valid_rooms(width1, linter_spacing, catalog: dict) -> np.ndarray:
+    # where fixed raises: width1 inside the first rod distance, or no whole
+    # piece of the spacing in an L-patti
+    spacing = np.where(linter_spacing != 0, linter_spacing, 1)
+    return (width1 > catalog['first_rod_distance']) & (linter_spacing != 0) & (catalog['l_patti_length'] // spacing != 0)
+
+def _calculate_valid(length1, length2, width1, width2, linter_spacing, catalog: dict, foot) -> dict:
+    total_perimeter = length1 + length2 + width1 + width2
+    params_full, params_extra = _calculate_parameters(total_perimeter, catalog, foot)
+
+    main_rods_count, main_lengths, main_offsets, extra_main_needed = _calculate_main_rods(length1, length2, width1, catalog)
+    cross_rods_count, cross_lengths, cross_offsets, longer_wall, has_cross, cross_total, last_cross = _calculate_cross_rods(length1, length2, width1, width2, catalog)
+
+    full_l_patti, l_patti_cuts, remaining_cuts = _calculate_l_patti(linter_spacing, width1, main_lengths, main_offsets, catalog)
+    room_area = (length1 + length2) * (width1 + width2)
+    board_count, board_extra_sqft = _calculate_board_requirements(room_area, catalog, foot)
+
+    main_scale = width1 * foot
+    cross_scale = longer_wall * foot
+    main_rows = np.repeat(np.arange(len(width1)), np.diff(main_offsets))
+    cross_rows = np.repeat(np.arange(len(width1)), np.diff(cross_offsets))
+
+    return {
+        'parameters_full': params_full,
+        'parameters_extra': params_extra,
+        'main_rods': main_rods_count,
+        'cross_rods': cross_rods_count,
+        'connecting_clips': main_rods_count * cross_rods_count,
+        'screws': -(-total_perimeter // foot) * 12,
+        'total_parameter_length': _round2(total_perimeter, foot),
+        'main_rods_length': _round2(_ragged_total(main_lengths, main_offsets), main_scale),
+        'cross_rods_length': np.where(has_cross, _round2(cross_total, cross_scale), 0.0),
+        'l_patti_count': l_patti_cuts,
+        'black_screws': -(-room_area // (4000 * foot * foot)),
+        'fasteners': l_patti_cuts,
+        'fastener_clips': l_patti_cuts,
+        'board_count': board_count,
+        'board_extra_sqft': board_extra_sqft,
+        'full_l_patti_count': full_l_patti,
+        'l_patti_cuts': l_patti_cuts,
+        'l_patti_remaining': remaining_cuts,
+        'l_patti_cut_size': linter_spacing / foot,
+        'last_cross_length': np.where(has_cross, _round2(last_cross, cross_scale), 0.0),
+        'cross_lengths': (cross_lengths / cross_scale[cross_rows], cross_offsets),
+        'main_lengths': (main_lengths / main_scale[main_rows], main_offsets),
+        'last_main_length': _round2(main_lengths[main_offsets[1:] - 1], main_scale),
+        'extra_main_needed': np.where(extra_main_needed > 0, _round2(extra_main_needed, main_scale), 0.0),
+    }
+
+def _calculate_one(dimensions: RoomDimensions, catalog: MaterialCatalog):
+    # rooms off the int64 path; None where fixed cannot calculate the room
+    try:
+        return calculate_fixed(dimensions, catalog)
+    except (ArithmeticError, ValueError):
+        return None
+
+def calculate_ceiling_requirements_batch(
+    length1,
+    length2,
+    width1,
+    width2,
+    linter_spacing,
+    catalog: Union[MaterialCatalog, Sequence[MaterialCatalog]] = DEFAULT_CATALOG
+) -> BatchCalculation:
+    columns = np.broadcast_arrays(*(np.asarray(column, dtype=np.float64).ravel() for column in (length1, length2, width1, width2, linter_spacing)))
+    rooms = len(columns[0])
+    sizes = _catalog_ticks(catalog, rooms)
+
+    ticks, fits = zip(*(_ticks(column) for column in columns))
+    walls, units, foot, small = _in_units(*ticks, sizes)
+    fast = np.logical_and.reduce(fits) & small
+    valid = fast & _valid_rooms(walls[2], walls[4], units)
+    computed = _calculate_valid(*(column[valid] for column in walls), _select(units, valid), foot[valid])
+
+    slow = np.flatnonzero(~fast)
+    catalogs = [catalog] * rooms if isinstance(catalog, MaterialCatalog) else catalog
+    slow_results = [_calculate_one(RoomDimensions(*(column[index] for column in columns)), catalogs[index]) for index in slow]
+    valid[slow] = [result is not None for result in slow_results]
+    slow = [(index, result) for index, result in zip(slow, slow_results) if result is not None]
+
+    results = {}
+    fast_rows = np.flatnonzero(fast & valid)
+    for name, values in computed.items():
+        if isinstance(values, tuple):
+            flat, offsets = values
+            counts = np.zeros(rooms, dtype=np.int64)
+            counts[fast_rows] = np.diff(offsets)
+            for index, result in slow:
+                counts[index] = len(getattr(result, name))
+            full_offsets = np.zeros(rooms + 1, dtype=np.int64)
+            np.cumsum(counts, out=full_offsets[1:])
+            if slow:
+                placed = np.empty(full_offsets[-1])
+                _, rows, local = _ragged_layout(np.diff(offsets))
+                placed[full_offsets[fast_rows][rows] + local] = flat
+                for index, result in slow:
+                    placed[full_offsets[index]:full_offsets[index + 1]] = getattr(result, name)
+                flat = placed
+            results[name] = flat
+            results[name.replace('_lengths', '_offsets')] = full_offsets
+        else:
+            column = np.zeros(rooms, dtype=np.float64 if values.dtype.kind == 'f' else np.int64)
+            column[fast_rows] = values
+            for index, result in slow:
+                value = getattr(result, name)
+                column[index] = float(value.split()[0]) if name == 'extra_main_needed' and value else value or 0
+            results[name] = column
+
+    return BatchCalculation(valid=valid, **results)
+
+def calculate_rooms_batch(
+    rooms: list[RoomDimensions],
+    catalog: Union[MaterialCatalog, Sequence[MaterialCatalog]] = DEFAULT_CATALOG
+) -> BatchCalculation:
+    return calculate_ceiling_requirements_batch(
+        [room.length1 for room in rooms],
+        [room.length2 for room in rooms],
+        [room.width1 for room in rooms],
+        [room.width2 for room in rooms],
+        [room.linter_spacing for room in rooms],
+        catalog
+    )
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+import batch
+import fixed
+import series
+import utils
+from utils import RoomDimensions
+
+# Rooms from a bedroom to a warehouse; main and cross rods grow with the
+# walls, and L-patti with the mains, so the stages scale differently.
+TIERS = {
+    'bedroom': RoomDimensions(12.0, 11.5, 10.0, 10.5, 2.0),
+    'living': RoomDimensions(20.5, 19.0, 15.25, 16.0, 2.0),
+    'hall': RoomDimensions(42.0, 40.5, 30.0, 31.5, 2.5),
+    'showroom': RoomDimensions(105.0, 98.5, 62.0, 64.25, 2.0),
+    'warehouse': RoomDimensions(410.0, 396.5, 252.0, 260.75, 1.5),
+}
+BATCH_ROOMS = 1000
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_core_baseline.json')
+# slower than the baseline by more than this fraction is a regression...
+DEFAULT_THRESHOLD = 0.25
+# ...unless it is within timer noise
+MIN_REGRESSION_US = 0.5
+# the counts a crew orders by; a change in any of them fails the run
+COUNT_FIELDS = (
+    'parameters_full',
+    'main_rods',
+    'cross_rods',
+    'connecting_clips',
+    'screws',
+    'l_patti_count',
+    'black_screws',
+    'board_count',
+    'full_l_patti_count',
+    'l_patti_remaining',
+)
+
+def cases(room: RoomDimensions) -> dict:
+    # name -> (function, rooms per call)
+    walls = (room.length1, room.length2, room.width1, room.width2)
+    main_lengths = utils.calculate_main_rods(*walls)[1]
+    rooms = [room] * BATCH_ROOMS
+    return {
+        'utils.calculate_rod_length_with_overlap': (lambda: utils.calculate_rod_length_with_overlap(max(walls)), 1),
+        'utils.calculate_parameters': (lambda: utils.calculate_parameters(room), 1),
+        'utils.calculate_main_rods': (lambda: utils.calculate_main_rods(*walls), 1),
+        'utils.calculate_cross_rods': (lambda: utils.calculate_cross_rods(*walls), 1),
+        'utils.calculate_l_patti': (lambda: utils.calculate_l_patti(max(room.width1, room.width2), room.linter_spacing, main_lengths), 1),
+        'utils.calculate_board_requirements': (lambda: utils.calculate_board_requirements(room), 1),
+        'utils.calculate_room_area': (lambda: utils.calculate_room_area(room), 1),
+        'utils.calculate_ceiling_requirements': (lambda: utils.calculate_ceiling_requirements(room), 1),
+        'utils.calculate_float_requirements': (lambda: utils.calculate_float_requirements(room), 1),
+        'fixed.calculate_ceiling_requirements': (lambda: fixed.calculate_ceiling_requirements(room), 1),
+        'series.calculate_ceiling_summary': (lambda: series.calculate_ceiling_summary(room), 1),
+        'series.calculate_closed_form_summary': (lambda: series.calculate_closed_form_summary(room), 1),
+        'batch.calculate_rooms_batch': (lambda: batch.calculate_rooms_batch(rooms), BATCH_ROOMS),
+    }
+
+def measure(function, repeat: int) -> float:
+    # best of repeat runs of at least 0.2 s each, in microseconds per call
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return 1e6 * min(timer.repeat(repeat, number)) / number
+
+def counts(room: RoomDimensions) -> dict:
+    result = utils.calculate_ceiling_requirements(room)
+    return {name: getattr(result, name) for name in COUNT_FIELDS}
+
+def run(tiers: list[str], case_filter: str, repeat: int) -> dict:
+    report = {}
+    for tier in tiers:
+        room = TIERS[tier]
+        report[tier] = {
+            'counts': counts(room),
+            'us': {
+                name: round(measure(function, repeat) / rooms, 3)
+                for name, (function, rooms) in cases(room).items()
+                if case_filter in name
+            },
+        }
+    return report
+
+def compare(report: dict, baseline: dict, threshold: float) -> tuple[dict, bool]:
+    failed = False
+    comparison = {}
+    for tier, measured in report.items():
+        before = baseline.get('tiers', {}).get(tier)
+        if before is None:
+            comparison[tier] = {'note': 'no baseline for this tier'}
+            continue
+
+        changed = {name: (before['counts'][name], value) for name, value in measured['counts'].items() if before['counts'].get(name) != value}
+        timings = {}
+        for name, us in measured['us'].items():
+            baseline_us = before['us'].get(name)
+            if baseline_us is None:
+                timings[name] = {'us': us}
+                continue
+            regressed = us > baseline_us * (1 + threshold) and us - baseline_us > MIN_REGRESSION_US
+            timings[name] = {
+                'us': us,
+                'baseline_us': baseline_us,
+                'change_percent': round(100 * (us / baseline_us - 1), 1),
+                'regressed': regressed,
+            }
+            failed |= regressed
+        comparison[tier] = {'counts_changed': changed, 'timings': timings}
+        failed |= bool(changed)
+    return comparison, failed
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Time the calculation stages and the full pipeline, and compare with a stored baseline.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='store this run as the new baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown, as a fraction')
+    parser.add_argument('--tier', action='append', choices=list(TIERS), help='only these tiers (repeatable)')
+    parser.add_argument('--case', default='', help='only cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    report = run(args.tier or list(TIERS), args.case, args.repeat)
+    environment = {'python': platform.python_version(), 'machine': platform.machine()}
+
+    if args.save:
+        with open(args.baseline, 'w') as handle:
+            json.dump({**environment, 'tiers': report}, handle, indent=2)
+            handle.write('\n')
+        print(json.dumps(report, indent=2))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(json.dumps(report, indent=2))
+        print(f"No baseline at {args.baseline}; run with --save to store one", file=sys.stderr)
+        return 0
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    comparison, failed = compare(report, baseline, args.threshold)
+    output = {'threshold': args.threshold, 'tiers': comparison}
+    if any(baseline.get(key) != value for key, value in environment.items()):
+        # timings from another interpreter or machine only roughly compare
+        output['note'] = f"baseline was taken on Python {baseline.get('python')} ({baseline.get('machine')})"
+    print(json.dumps(output, indent=2))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
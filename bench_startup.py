@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CORE_MODULES = ('utils', 'units', 'translations')
+HEAVY_MODULES = ('numpy', 'pandas', 'xlsxwriter')
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - started
+print(elapsed, ' '.join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+RENDER_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+loaded = time.perf_counter()
+AppTest.from_file('app.py', default_timeout=60).run()
+rendered = time.perf_counter()
+print(rendered - loaded, ' '.join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+def _run(script: str) -> tuple[float, list[str]]:
+    # a fresh interpreter per sample, so every run is a cold start
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.split('\n')[-2]
+    seconds, _, loaded = output.partition(' ')
+    return float(seconds), loaded.split()
+
+def measure(script: str, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        seconds, loaded = _run(script)
+        samples.append(seconds)
+    return {
+        'median_ms': round(1000 * statistics.median(samples), 2),
+        'min_ms': round(1000 * min(samples), 2),
+        'heavy_modules_loaded': loaded,
+    }
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure cold-start import and first-render time.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-render', action='store_true', help='skip the Streamlit first-render measurement')
+    args = parser.parse_args(argv)
+
+    report = {
+        'core_import': measure(IMPORT_SCRIPT.format(modules=CORE_MODULES, heavy=HEAVY_MODULES), args.repeat),
+        'app_import': measure(IMPORT_SCRIPT.format(modules=('streamlit', 'app'), heavy=HEAVY_MODULES), args.repeat),
+    }
+    if not args.no_render:
+        report['first_render'] = measure(RENDER_SCRIPT.format(heavy=HEAVY_MODULES), args.repeat)
+
+    print(json.dumps(report, indent=2))
+    return 1 if report['core_import']['heavy_modules_loaded'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
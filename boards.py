@@ -0,0 +1,295 @@
+from dataclasses import dataclass, field
+from fractions import Fraction
+from functools import lru_cache
+from math import ceil, floor
+from typing import Union
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from fixed import FOOT, SQUARE_FOOT, catalog_ticks
+from polygon import PolygonRoom, polygon_area
+from units import to_ticks
+from utils import RoomDimensions
+
+MODES = ('fast', 'thorough')
+# rooms whose sheet counts are kept for bills of materials and sweeps
+SHEET_COUNT_CACHE_SIZE = 65536
+
+# Guillotine placement: a piece goes in the bottom-left corner of a free
+# rectangle, and the rest of that rectangle is split into two by one straight
+# cut through the sheet, along the axis the split rule picks.
+SPLIT_RULES = ('shorter', 'longer', 'area')
+SORT_KEYS = {
+    'area': lambda piece: (piece[0] * piece[1], max(piece)),
+    'longer': lambda piece: (max(piece), min(piece)),
+    'perimeter': lambda piece: (piece[0] + piece[1], max(piece)),
+}
+
+@dataclass
+class Placement:
+    # a piece cut from a sheet, in feet from the sheet's corner; rotated
+    # pieces are cut with their length along the sheet's width
+    x: float
+    y: float
+    length: float
+    width: float
+    band: int
+    rotated: bool = False
+
+@dataclass
+class SheetPlan:
+    placements: list[Placement] = field(default_factory=list)
+    # pieces of the sheet left over, as (length, width) in feet
+    offcuts: list[tuple[float, float]] = field(default_factory=list)
+
+@dataclass
+class BoardLayout:
+    sheet_length: float
+    sheet_width: float
+    # sheets fixed whole, and sheets cut into pieces
+    full_sheets: int
+    cut_sheets: list[SheetPlan]
+    ceiling_area: float
+    # rows of sheets run along the room's length ('x') or width ('y'); in
+    # turned rows the sheets stand with their length across the row
+    direction: str
+    turned_rows: int = 0
+
+    @property
+    def sheet_count(self) -> int:
+        return self.full_sheets + len(self.cut_sheets)
+
+    @property
+    def waste_sqft(self) -> float:
+        return round(self.sheet_count * self.sheet_length * self.sheet_width - self.ceiling_area, 2)
+
+    @property
+    def waste_percent(self) -> float:
+        total = self.sheet_count * self.sheet_length * self.sheet_width
+        return 100 * self.waste_sqft / total if total else 0.0
+
+    @property
+    def offcut_sqft(self) -> float:
+        # area left in whole rectangles on the cut sheets, as opposed to trimmings
+        return round(sum(length * width for sheet in self.cut_sheets for length, width in sheet.offcuts), 2)
+
+    def cut_diagram(self) -> list[str]:
+        lines = [f"{self.full_sheets} full {self.sheet_length:g} x {self.sheet_width:g} ft sheet(s)"]
+        for number, sheet in enumerate(self.cut_sheets, start=1):
+            pieces = ', '.join(
+                f"{placement.length:.2f} x {placement.width:.2f} at ({placement.x:.2f}, {placement.y:.2f})"
+                f"{' turned' if placement.rotated else ''} for row {placement.band + 1}"
+                for placement in sheet.placements
+            )
+            lines.append(f"Sheet {number}: {pieces}")
+        return lines
+
+def room_outline(dimensions: RoomDimensions) -> list[tuple[float, float]]:
+    # the trapezoid the area formula describes: length1 and length2 on
+    # opposite walls, the average of the two widths apart
+    width = (dimensions.width1 + dimensions.width2) / 2
+    return [(0, 0), (dimensions.length1, 0), (dimensions.length2, width), (0, width)]
+
+def _clip(points: list[tuple], axis: int, limit: int, keep_below: bool) -> list[tuple]:
+    # Sutherland-Hodgman against one horizontal or vertical line
+    inside = (lambda point: point[axis] <= limit) if keep_below else (lambda point: point[axis] >= limit)
+    clipped = []
+    for index, current in enumerate(points):
+        previous = points[index - 1]
+        if inside(current) != inside(previous):
+            share = Fraction(limit - previous[axis], current[axis] - previous[axis])
+            crossing = [previous[0] + share * (current[0] - previous[0]), previous[1] + share * (current[1] - previous[1])]
+            crossing[axis] = limit
+            clipped.append(tuple(crossing))
+        if inside(current):
+            clipped.append(current)
+    return clipped
+
+def _rows(outline: list[tuple[int, int]], plan: list[tuple[int, int]]) -> list[tuple[int, int, int, int]]:
+    # (run, rise, height, extent) of each row of sheets from the bottom of the
+    # outline up. plan gives each row's (run, rise): how far one sheet reaches
+    # along the row and across it. A row covers the widest extent of the
+    # outline anywhere inside it, so a concave outline is covered generously,
+    # never short.
+    low = min(y for _, y in outline)
+    top = max(y for _, y in outline)
+    rows = []
+    for run, rise in plan:
+        if low >= top:
+            break
+        high = min(low + rise, top)
+        inside = _clip(_clip(outline, 1, low, keep_below=False), 1, high, keep_below=True)
+        if inside:
+            xs = [x for x, _ in inside]
+            rows.append((run, rise, high - low, ceil(max(xs)) - floor(min(xs))))
+        low = high
+    return rows
+
+def _pieces(rows: list[tuple[int, int, int, int]]) -> tuple[int, list[tuple[int, int, int]]]:
+    # whole sheets along each row, and the (length, width, row) pieces to cut
+    full_sheets = 0
+    pieces = []
+    for band, (run, rise, height, extent) in enumerate(rows):
+        whole, remainder = divmod(extent, run)
+        if height == rise:
+            full_sheets += whole
+        else:
+            pieces.extend([(run, height, band)] * whole)
+        if remainder:
+            pieces.append((remainder, height, band))
+    return full_sheets, pieces
+
+def _row_plans(span: int, sheet_length: int, sheet_width: int) -> list[list[tuple[int, int]]]:
+    # every way to cover the span with rows of sheets laid lengthwise (width
+    # across the row) and rows of sheets turned (length across the row),
+    # without a spare row, with the turned rows first or last
+    lengthwise, turned = (sheet_length, sheet_width), (sheet_width, sheet_length)
+    plans = []
+    for turned_rows in range(-(-span // sheet_length) + 1):
+        lengthwise_rows = max(0, -(-(span - turned_rows * sheet_length) // sheet_width))
+        if turned_rows and lengthwise_rows and (turned_rows - 1) * sheet_length + lengthwise_rows * sheet_width >= span:
+            continue
+        plans.append([turned] * turned_rows + [lengthwise] * lengthwise_rows)
+        if turned_rows and lengthwise_rows:
+            plans.append([lengthwise] * lengthwise_rows + [turned] * turned_rows)
+    return plans
+
+def _split(free: tuple, length: int, width: int, rule: str) -> list[tuple]:
+    x, y, free_length, free_width = free
+    right, above = free_length - length, free_width - width
+    if rule == 'shorter':
+        across = right < above
+    elif rule == 'longer':
+        across = right >= above
+    else:
+        # keep the larger leftover in one piece
+        across = right * width < free_length * above
+    if across:
+        # cut across the full length first: a strip above, the rest beside the piece
+        parts = [(x, y + width, free_length, above), (x + length, y, right, width)]
+    else:
+        parts = [(x + length, y, right, free_width), (x, y + width, length, above)]
+    return [part for part in parts if part[2] > 0 and part[3] > 0]
+
+def _pack(pieces: list[tuple[int, int, int]], sheet_length: int, sheet_width: int, order: str, rule: str) -> list[tuple[list, list]]:
+    # best-area-fit guillotine packing; every free rectangle on every open
+    # sheet is an offcut the next piece may use
+    sheets: list[tuple[list, list]] = []
+    for length, width, band in sorted(pieces, key=lambda piece: SORT_KEYS[order](piece[:2]), reverse=True):
+        best = None
+        for sheet, (_, free) in enumerate(sheets):
+            for slot, (_, _, free_length, free_width) in enumerate(free):
+                for turned, (along, across) in ((False, (length, width)), (True, (width, length))):
+                    if along <= free_length and across <= free_width:
+                        spare = free_length * free_width - along * across
+                        if best is None or spare < best[0]:
+                            best = (spare, sheet, slot, turned)
+        if best is None:
+            sheets.append(([], [(0, 0, sheet_length, sheet_width)]))
+            turned = not (length <= sheet_length and width <= sheet_width)
+            best = (0, len(sheets) - 1, 0, turned)
+
+        _, sheet, slot, turned = best
+        placements, free = sheets[sheet]
+        along, across = (width, length) if turned else (length, width)
+        x, y, _, _ = free[slot]
+        placements.append((x, y, length, width, band, turned))
+        free[slot:slot + 1] = _split(free[slot], along, across, rule)
+    return sheets
+
+def _best_packing(rows, sheet_length: int, sheet_width: int, trials: list[tuple[str, str]]):
+    full_sheets, pieces = _pieces(rows)
+    best = None
+    for order, rule in trials:
+        sheets = _pack(pieces, sheet_length, sheet_width, order, rule)
+        # fewest sheets, then the most offcut left in one piece
+        largest = max((part[2] * part[3] for _, free in sheets for part in free), default=0)
+        score = (full_sheets + len(sheets), -largest)
+        if best is None or score < best[0]:
+            best = (score, full_sheets, sheets)
+    return best
+
+def plan_boards(
+    room: Union[RoomDimensions, PolygonRoom],
+    mode: str = 'fast',
+    catalog: MaterialCatalog = DEFAULT_CATALOG
+) -> BoardLayout:
+    # Lays sheets in rows across the ceiling: whole sheets along each row,
+    # then the short ends and the part-width last row are cut from as few
+    # sheets as guillotine cuts allow. 'fast' lays every row along the room's
+    # length with the sheet's length along the row; 'thorough' also tries
+    # rows along the width, mixes of lengthwise and turned rows, and every
+    # packing heuristic.
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+    ticks = catalog_ticks(catalog)
+    sheet_length, sheet_width = ticks.board_length, ticks.board_width
+    if isinstance(room, PolygonRoom):
+        outline = room.outline
+        ceiling_area = polygon_area(room)
+    else:
+        outline = room_outline(room)
+        ceiling_area = Fraction(to_ticks(room.length1) + to_ticks(room.length2)) * (to_ticks(room.width1) + to_ticks(room.width2)) / (4 * SQUARE_FOOT)
+    points = [(to_ticks(x), to_ticks(y)) for x, y in outline]
+    if ceiling_area <= 0:
+        raise ValueError("the ceiling has no area to board")
+
+    if mode == 'fast':
+        oriented = {'x': points}
+        plans = {'x': [[(sheet_length, sheet_width)] * -(-(max(y for _, y in points) - min(y for _, y in points)) // sheet_width)]}
+    else:
+        oriented = {'x': points, 'y': [(y, x) for x, y in points]}
+        plans = {
+            direction: _row_plans(max(y for _, y in rotated) - min(y for _, y in rotated), sheet_length, sheet_width)
+            for direction, rotated in oriented.items()
+        }
+
+    # the thorough mode scores every row plan with one quick packing, then
+    # tries every packing heuristic on the few best plans
+    trials = [('area', 'shorter')]
+    candidates = [(None, direction, index) for direction in plans for index in range(len(plans[direction]))]
+    if mode == 'thorough':
+        candidates = sorted(
+            (_best_packing(_rows(oriented[direction], plans[direction][index]), sheet_length, sheet_width, trials)[0], direction, index)
+            for _, direction, index in candidates
+        )
+        trials = [(order, rule) for order in SORT_KEYS for rule in SPLIT_RULES]
+    best = None
+    for _, direction, index in candidates[:3]:
+        rows = _rows(oriented[direction], plans[direction][index])
+        score, full_sheets, sheets = _best_packing(rows, sheet_length, sheet_width, trials)
+        if best is None or score < best[0]:
+            best = (score, full_sheets, sheets, direction, rows)
+
+    _, full_sheets, sheets, direction, rows = best
+    return BoardLayout(
+        sheet_length=sheet_length / FOOT,
+        sheet_width=sheet_width / FOOT,
+        full_sheets=full_sheets,
+        cut_sheets=[
+            SheetPlan(
+                placements=[
+                    Placement(x / FOOT, y / FOOT, length / FOOT, width / FOOT, band, turned)
+                    for x, y, length, width, band, turned in placements
+                ],
+                offcuts=[(length / FOOT, width / FOOT) for _, _, length, width in free]
+            )
+            for placements, free in sheets
+        ],
+        ceiling_area=float(ceiling_area),
+        direction=direction,
+        turned_rows=sum(run == sheet_width != sheet_length for run, *_ in rows)
+    )
+
+def layout_sheet_count(room: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> int:
+    # sheets to order for a room by the fast layout, 0 when it has no ceiling
+    # area; projects repeat the same flats, so counts are kept per size
+    return _sheet_count(room.length1, room.length2, room.width1, room.width2, catalog.board_length, catalog.board_width)
+
+@lru_cache(maxsize=SHEET_COUNT_CACHE_SIZE)
+def _sheet_count(length1: float, length2: float, width1: float, width2: float, board_length: float, board_width: float) -> int:
+    room = RoomDimensions(length1, length2, width1, width2, 0)
+    try:
+        return plan_boards(room, catalog=MaterialCatalog(board_length=board_length, board_width=board_width)).sheet_count
+    except ValueError:
+        return 0
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import astuple, dataclass, replace
+from typing import Callable, Optional
+
+from fixed import fixed_dimensions
+from utils import CeilingCalculation, RoomDimensions, calculate_ceiling_requirements
+
+DEFAULT_MAXSIZE = 1024
+EVICTION_POLICIES = ('lru', 'fifo')
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ResultCache:
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: Optional[float] = None,
+        policy: str = 'lru',
+        calculate: Callable[[RoomDimensions], CeilingCalculation] = calculate_ceiling_requirements,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(EVICTION_POLICIES)}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.policy = policy
+        self.calculate = calculate
+        self.clock = clock
+
+        self._entries: OrderedDict[tuple, tuple[float, CeilingCalculation]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, dimensions: RoomDimensions) -> tuple:
+        # whole ticks, so equal rooms typed in any unit share a key
+        return astuple(fixed_dimensions(dimensions))
+
+    def get(self, dimensions: RoomDimensions) -> Optional[CeilingCalculation]:
+        key = self.key(dimensions)
+        with self._lock:
+            result = self._lookup(key)
+        return _copy_result(result) if result is not None else None
+
+    def get_or_calculate(
+        self,
+        dimensions: RoomDimensions,
+        calculate: Optional[Callable[[RoomDimensions], CeilingCalculation]] = None
+    ) -> CeilingCalculation:
+        key = self.key(dimensions)
+        with self._lock:
+            result = self._lookup(key)
+        if result is None:
+            result = (calculate or self.calculate)(dimensions)
+            with self._lock:
+                self._store(key, result)
+        return _copy_result(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, self.expirations, len(self._entries), self.maxsize)
+
+    def _lookup(self, key: tuple) -> Optional[CeilingCalculation]:
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and self.clock() - entry[0] > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.policy == 'lru':
+            self._entries.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key: tuple, result: CeilingCalculation) -> None:
+        self._entries[key] = (self.clock(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+def _copy_result(result: CeilingCalculation) -> CeilingCalculation:
+    # callers get their own lists so editing one quote can't leak into the cache
+    return replace(result, cross_lengths=list(result.cross_lengths), main_lengths=list(result.main_lengths))
+
+_default_cache = ResultCache()
+
+def get_cache() -> ResultCache:
+    return _default_cache
+
+def configure_cache(
+    maxsize: int = DEFAULT_MAXSIZE,
+    ttl: Optional[float] = None,
+    policy: str = 'lru'
+) -> ResultCache:
+    global _default_cache
+    _default_cache = ResultCache(maxsize=maxsize, ttl=ttl, policy=policy)
+    return _default_cache
+
+def cached_calculate_ceiling_requirements(dimensions: RoomDimensions) -> CeilingCalculation:
+    return _default_cache.get_or_calculate(dimensions)
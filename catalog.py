@@ -0,0 +1,34 @@
+from dataclasses import dataclass, fields
+
+@dataclass(frozen=True)
+class MaterialCatalog:
+    # layout, in feet
+    first_rod_distance: float = 2
+    main_spacing: float = 4
+    main_wall_threshold: float = 3.5
+    cross_spacing: float = 2
+    cross_min_threshold: float = 2
+    cross_max_threshold: float = 2.5
+    first_l_patti: float = 3
+    l_patti_spacing: float = 4
+    l_patti_end_clearance: float = 1
+
+    # stock, in feet
+    rod_length: float = 12
+    parameter_length: float = 12
+    l_patti_length: float = 8
+    board_length: float = 6
+    board_width: float = 4
+
+    # overlaps where a run is longer than one piece of stock, in feet
+    main_overlap: float = 5/12
+    cross_overlap: float = 4/12
+    parameter_overlap: float = 4/12
+
+    @property
+    def board_area(self) -> float:
+        return self.board_length * self.board_width
+
+CATALOG_FIELDS = tuple(item.name for item in fields(MaterialCatalog))
+
+DEFAULT_CATALOG = MaterialCatalog()
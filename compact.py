@@ -0,0 +1,274 @@
+import json
+import struct
+from array import array
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Iterable, Union
+
+import numpy as np
+
+from batch import BatchCalculation, round2
+from utils import CeilingCalculation
+
+# Everything in a CeilingCalculation except the two rod length lists, with
+# extra_main_needed kept as the number of feet (0.0 when none are needed).
+RESULT_DTYPE = np.dtype([
+    ('parameters_full', '<i8'),
+    ('parameters_extra', '<f8'),
+    ('main_rods', '<i8'),
+    ('cross_rods', '<i8'),
+    ('connecting_clips', '<i8'),
+    ('screws', '<i8'),
+    ('total_parameter_length', '<f8'),
+    ('main_rods_length', '<f8'),
+    ('cross_rods_length', '<f8'),
+    ('l_patti_count', '<i8'),
+    ('black_screws', '<i8'),
+    ('fasteners', '<i8'),
+    ('fastener_clips', '<i8'),
+    ('board_count', '<i8'),
+    ('board_extra_sqft', '<f8'),
+    ('full_l_patti_count', '<i8'),
+    ('l_patti_cuts', '<i8'),
+    ('l_patti_remaining', '<i8'),
+    ('l_patti_cut_size', '<f8'),
+    ('last_cross_length', '<f8'),
+    ('last_main_length', '<f8'),
+    ('extra_main_needed', '<f8'),
+])
+SCALAR_FIELDS = RESULT_DTYPE.names
+
+# where each record's rods sit in the archive's one flat array of lengths
+LENGTH_COLUMNS = [('main_offset', '<i8'), ('main_count', '<i4'), ('cross_offset', '<i8'), ('cross_count', '<i4')]
+
+ARCHIVE_MAGIC = b'CEILARC\x00'
+ARCHIVE_VERSION = 1
+# magic, version, header length; the JSON header follows, padded to ALIGNMENT
+ARCHIVE_PREAMBLE = struct.Struct('<8sII')
+ALIGNMENT = 64
+
+def parse_extra_main(text: str) -> float:
+    # "12.50 FT" -> 12.5, "" -> 0.0
+    return float(text.split()[0]) if text else 0.0
+
+def format_extra_main(feet: float) -> str:
+    return f"{feet:.2f} FT" if feet > 0 else ""
+
+@dataclass(slots=True)
+class CompactCalculation:
+    parameters_full: int
+    parameters_extra: float
+    main_rods: int
+    cross_rods: int
+    connecting_clips: int
+    screws: int
+    total_parameter_length: float
+    main_rods_length: float
+    cross_rods_length: float
+    l_patti_count: int
+    black_screws: int
+    fasteners: int
+    fastener_clips: int
+    board_count: int
+    board_extra_sqft: float
+    full_l_patti_count: int
+    l_patti_cuts: int
+    l_patti_remaining: int
+    l_patti_cut_size: float
+    last_cross_length: float
+    last_main_length: float
+    extra_main_needed: float
+    cross_lengths: array
+    main_lengths: array
+
+    @classmethod
+    def from_calculation(cls, result: CeilingCalculation) -> 'CompactCalculation':
+        values = {name: getattr(result, name) for name in SCALAR_FIELDS}
+        values['extra_main_needed'] = parse_extra_main(result.extra_main_needed)
+        return cls(**values, cross_lengths=array('d', result.cross_lengths), main_lengths=array('d', result.main_lengths))
+
+    def to_calculation(self) -> CeilingCalculation:
+        values = {item.name: getattr(self, item.name) for item in fields(CeilingCalculation)}
+        values['extra_main_needed'] = format_extra_main(self.extra_main_needed)
+        values['cross_lengths'] = self.cross_lengths.tolist()
+        values['main_lengths'] = self.main_lengths.tolist()
+        return CeilingCalculation(**values)
+
+def _align(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+@dataclass
+class ResultColumns:
+    # many results laid out the way an archive stores them
+    records: np.ndarray
+    lengths: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> CompactCalculation:
+        return decode_result(self.records[index], self.lengths)
+
+    def take(self, order: np.ndarray) -> 'ResultColumns':
+        # the records in a new order, with their rod lengths moved to match
+        records = self.records[order]
+        counts = records['main_count'].astype(np.int64) + records['cross_count']
+        gather = np.repeat(records['main_offset'], counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        _set_offsets(records)
+        return ResultColumns(records, np.asarray(self.lengths)[gather])
+
+    @classmethod
+    def concatenate(cls, parts: list['ResultColumns']) -> 'ResultColumns':
+        records = np.concatenate([part.records for part in parts])
+        lengths = np.concatenate([np.asarray(part.lengths) for part in parts])
+        shift = np.repeat(np.cumsum([0] + [len(part.lengths) for part in parts[:-1]]), [len(part) for part in parts])
+        records['main_offset'] += shift
+        records['cross_offset'] += shift
+        return cls(records, lengths)
+
+def _floats(data: memoryview, offset: int, count: int) -> array:
+    lengths = array('d')
+    lengths.frombytes(data[8 * offset:8 * (offset + count)])
+    return lengths
+
+def decode_results(records: np.ndarray, lengths: np.ndarray) -> list[CompactCalculation]:
+    # many records at once: one tolist() for the records and one view of the
+    # lengths, instead of a NumPy scalar per field. Every record layout starts
+    # with RESULT_DTYPE, so the scalars are the front of each row.
+    names = records.dtype.names
+    if names[:len(SCALAR_FIELDS)] != SCALAR_FIELDS:
+        raise ValueError("records must start with the RESULT_DTYPE fields")
+
+    scalars = len(SCALAR_FIELDS)
+    main_offset, main_count, cross_offset, cross_count = (names.index(name) for name, _ in LENGTH_COLUMNS)
+    data = memoryview(np.ascontiguousarray(lengths, dtype='<f8')).cast('B')
+    return [
+        CompactCalculation(
+            *row[:scalars],
+            cross_lengths=_floats(data, row[cross_offset], row[cross_count]),
+            main_lengths=_floats(data, row[main_offset], row[main_count])
+        )
+        for row in np.asarray(records).tolist()
+    ]
+
+def decode_result(record: np.void, lengths: np.ndarray) -> CompactCalculation:
+    # only this record's rods are read, which matters for a mapped archive
+    start = int(min(record['main_offset'], record['cross_offset']))
+    rods = int(record['main_count'] + record['cross_count'])
+    single = np.array([record])
+    single['main_offset'] -= start
+    single['cross_offset'] -= start
+    return decode_results(single, lengths[start:start + rods])[0]
+
+def columns_from_results(results: Iterable[CeilingCalculation]) -> ResultColumns:
+    results = list(results)
+    records = np.zeros(len(results), dtype=RESULT_DTYPE.descr + LENGTH_COLUMNS)
+    for name in SCALAR_FIELDS:
+        if name == 'extra_main_needed':
+            records[name] = [parse_extra_main(result.extra_main_needed) for result in results]
+        else:
+            records[name] = [getattr(result, name) for result in results]
+
+    records['main_count'] = [len(result.main_lengths) for result in results]
+    records['cross_count'] = [len(result.cross_lengths) for result in results]
+    lengths = np.fromiter(
+        (length for result in results for lengths in (result.main_lengths, result.cross_lengths) for length in lengths),
+        dtype=np.float64
+    )
+    _set_offsets(records)
+    return ResultColumns(records, lengths)
+
+def columns_from_batch(batch: BatchCalculation) -> ResultColumns:
+    # only the rooms the batch could calculate, in order
+    valid = batch.valid
+    records = np.zeros(int(np.count_nonzero(valid)), dtype=RESULT_DTYPE.descr + LENGTH_COLUMNS)
+    for name in SCALAR_FIELDS:
+        records[name] = getattr(batch, name)[valid]
+    records['extra_main_needed'] = np.where(records['extra_main_needed'] > 0, round2(records['extra_main_needed']), 0.0)
+
+    main_counts = np.diff(batch.main_offsets)
+    cross_counts = np.diff(batch.cross_offsets)
+    records['main_count'] = main_counts[valid]
+    records['cross_count'] = cross_counts[valid]
+
+    # interleave each room's main lengths and then its cross lengths
+    rooms = np.arange(len(valid))
+    owner = np.concatenate((np.repeat(rooms, main_counts), np.repeat(rooms, cross_counts)))
+    kind = np.concatenate((np.zeros(len(batch.main_lengths), dtype=np.int8), np.ones(len(batch.cross_lengths), dtype=np.int8)))
+    order = np.lexsort((kind, owner))
+    lengths = np.concatenate((batch.main_lengths, batch.cross_lengths))[order]
+    _set_offsets(records)
+    return ResultColumns(records, lengths)
+
+def _set_offsets(records: np.ndarray) -> None:
+    per_record = records['main_count'].astype(np.int64) + records['cross_count']
+    starts = np.concatenate(([0], np.cumsum(per_record)[:-1])) if len(records) else np.zeros(0, dtype=np.int64)
+    records['main_offset'] = starts
+    records['cross_offset'] = starts + records['main_count']
+
+def write_archive(path: Union[str, Path], columns: ResultColumns) -> None:
+    header = json.dumps({
+        'descr': columns.records.dtype.descr,
+        'records': len(columns.records),
+        'lengths': len(columns.lengths),
+    }).encode()
+    start = _align(ARCHIVE_PREAMBLE.size + len(header))
+
+    with open(path, 'wb') as handle:
+        handle.write(ARCHIVE_PREAMBLE.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(header)))
+        handle.write(header)
+        handle.write(b'\x00' * (start - ARCHIVE_PREAMBLE.size - len(header)))
+        handle.write(np.ascontiguousarray(columns.records).tobytes())
+        handle.write(b'\x00' * (_align(columns.records.nbytes) - columns.records.nbytes))
+        handle.write(np.ascontiguousarray(columns.lengths, dtype='<f8').tobytes())
+
+class ResultArchive:
+    # A memory-mapped archive: opening one reads only the header, and each
+    # result is decoded from the mapped records when it is asked for.
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, 'rb') as handle:
+            magic, version, header_length = ARCHIVE_PREAMBLE.unpack(handle.read(ARCHIVE_PREAMBLE.size))
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"{self.path} is not a result archive")
+            if version != ARCHIVE_VERSION:
+                raise ValueError(f"{self.path} is archive version {version}, expected {ARCHIVE_VERSION}")
+            header = json.loads(handle.read(header_length))
+
+        dtype = np.dtype([tuple(item) for item in header['descr']])
+        start = _align(ARCHIVE_PREAMBLE.size + header_length)
+        self.records = self._map(dtype, start, header['records'])
+        self.lengths = self._map(np.dtype('<f8'), start + _align(dtype.itemsize * header['records']), header['lengths'])
+
+    def _map(self, dtype: np.dtype, offset: int, count: int) -> np.ndarray:
+        # np.memmap refuses empty arrays
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+    def close(self) -> None:
+        # Drops the maps so the file can be replaced or deleted; Windows
+        # refuses both while it is mapped. An array taken from the archive
+        # keeps its map until that array goes. The archive reads as empty
+        # afterwards.
+        self.records = np.zeros(0, dtype=self.records.dtype)
+        self.lengths = np.zeros(0, dtype=self.lengths.dtype)
+
+    def __enter__(self) -> 'ResultArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> CompactCalculation:
+        return decode_result(self.records[index], self.lengths)
+
+    def columns(self) -> ResultColumns:
+        return ResultColumns(self.records, self.lengths)
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
@@ -0,0 +1,189 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from math import ceil
+from typing import Iterable
+
+import numpy as np
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from utils import CeilingCalculation, calculate_rod_length_with_overlap
+
+ROD_STOCK_LENGTH = DEFAULT_CATALOG.rod_length
+L_PATTI_STOCK_LENGTH = DEFAULT_CATALOG.l_patti_length
+MAIN_OVERLAP = DEFAULT_CATALOG.main_overlap
+CROSS_OVERLAP = DEFAULT_CATALOG.cross_overlap
+SIXTEENTHS_PER_FOOT = 192
+MODES = ('fast', 'thorough')
+
+@dataclass
+class CutPlan:
+    stock_length: float
+    stock_count: int
+    pieces: int
+    used_length: float
+    waste: float
+    lower_bound: int
+    patterns: list[tuple[int, list[float]]] = field(default_factory=list)
+
+    @property
+    def waste_percent(self) -> float:
+        total = self.stock_count * self.stock_length
+        return 100 * self.waste / total if total else 0.0
+
+def rod_pieces(length: float, standard_length: float = ROD_STOCK_LENGTH, overlap: float = MAIN_OVERLAP) -> list[float]:
+    rods, total_length = calculate_rod_length_with_overlap(length, standard_length, overlap)
+    return [standard_length] * (rods - 1) + [total_length - standard_length * (rods - 1)]
+
+def required_pieces(results: Iterable[CeilingCalculation], catalog: MaterialCatalog = DEFAULT_CATALOG) -> dict[str, list[float]]:
+    pieces = {'main': [], 'cross': [], 'l_patti': []}
+    for result in results:
+        for length in result.main_lengths:
+            pieces['main'].extend(rod_pieces(length, catalog.rod_length, catalog.main_overlap))
+        for length in result.cross_lengths:
+            pieces['cross'].extend(rod_pieces(length, catalog.rod_length, catalog.cross_overlap))
+        pieces['l_patti'].extend([result.l_patti_cut_size] * result.l_patti_cuts)
+    return pieces
+
+def _to_sixteenths(length: float) -> int:
+    # round up to the next 1/16 inch so a planned cut is never short
+    return ceil(round(length * SIXTEENTHS_PER_FOOT, 6))
+
+def _first_fit_decreasing(sizes: list[int], capacity: int) -> list[list[int]]:
+    # max-tree over bin slots: leftmost slot with room for the piece in O(log n)
+    leaves = 1
+    while leaves < max(len(sizes), 1):
+        leaves *= 2
+    tree = [capacity] * (2 * leaves)
+    bins: list[list[int]] = []
+
+    for size in sorted(sizes, reverse=True):
+        node = 1
+        while node < leaves:
+            node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        slot = node - leaves
+        if slot == len(bins):
+            bins.append([])
+        bins[slot].append(size)
+
+        tree[node] -= size
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    return bins
+
+def _best_pattern(lengths: np.ndarray, demand: np.ndarray, capacity: int) -> dict[int, int]:
+    # subset-sum over every remaining piece (binary-split by multiplicity);
+    # value equals length, so the fullest reachable fill is the best pattern
+    reached_by = np.full(capacity + 1, -1, dtype=np.int64)
+    reachable = np.zeros(capacity + 1, dtype=bool)
+    reachable[0] = True
+    items = []
+
+    for index, (length, count) in enumerate(zip(lengths, np.minimum(demand, capacity // lengths))):
+        chunk = 1
+        while count > 0:
+            take = min(chunk, count)
+            weight = int(length) * int(take)
+            if weight <= capacity:
+                shifted = np.zeros(capacity + 1, dtype=bool)
+                shifted[weight:] = reachable[:capacity + 1 - weight]
+                new = shifted & ~reachable
+                reached_by[new] = len(items)
+                reachable |= shifted
+            items.append((index, int(take), weight))
+            count -= take
+            chunk *= 2
+
+    fill = int(np.flatnonzero(reachable)[-1])
+    pattern: dict[int, int] = {}
+    while fill > 0:
+        index, take, weight = items[reached_by[fill]]
+        pattern[index] = pattern.get(index, 0) + take
+        fill -= weight
+    return pattern
+
+def _sequential_patterns(sizes: list[int], capacity: int, deadline: float) -> list[list[int]]:
+    counts = Counter(sizes)
+    lengths = np.array(sorted(counts, reverse=True), dtype=np.int64)
+    demand = np.array([counts[length] for length in lengths], dtype=np.int64)
+    bins: list[list[int]] = []
+
+    while demand.any() and time.monotonic() < deadline:
+        available = demand > 0
+        pattern = _best_pattern(lengths[available], demand[available], capacity)
+        indices = np.flatnonzero(available)
+        repeat = min(int(demand[indices[index]]) // take for index, take in pattern.items())
+        cut = [int(lengths[indices[index]]) for index, take in pattern.items() for _ in range(take)]
+        bins.extend(list(cut) for _ in range(repeat))
+        for index, take in pattern.items():
+            demand[indices[index]] -= take * repeat
+
+    leftover = [int(length) for length, count in zip(lengths, demand) for _ in range(int(count))]
+    return bins + _first_fit_decreasing(leftover, capacity) if leftover else bins
+
+def _repack_loosest(bins: list[list[int]], capacity: int, deadline: float) -> list[list[int]]:
+    # FFD waste collects in its last, loosest bins: re-solve just those with
+    # best-fill patterns, widening the window while there is time left
+    lower_bound = ceil(sum(map(sum, bins)) / capacity)
+    window = max(16, 4 * (len(bins) - lower_bound))
+    while len(bins) > lower_bound and time.monotonic() < deadline:
+        bins.sort(key=sum, reverse=True)
+        window = min(window, len(bins))
+        loosest = [size for stock in bins[-window:] for size in stock]
+        repacked = _sequential_patterns(loosest, capacity, deadline)
+        if len(repacked) < window:
+            bins = bins[:-window] + repacked
+        elif window == len(bins):
+            break
+        else:
+            window *= 2
+    return bins
+
+def optimise_cutting(
+    pieces: list[float],
+    stock_length: float = ROD_STOCK_LENGTH,
+    mode: str = 'fast',
+    time_limit: float = 2.0
+) -> CutPlan:
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+    capacity = _to_sixteenths(stock_length)
+    sizes = [_to_sixteenths(piece) for piece in pieces if piece > 0]
+    if any(size > capacity for size in sizes):
+        raise ValueError(f"pieces longer than the {stock_length} ft stock must be split first (see rod_pieces)")
+
+    bins = _first_fit_decreasing(sizes, capacity)
+    if mode == 'thorough' and sizes:
+        bins = _repack_loosest(bins, capacity, time.monotonic() + time_limit)
+
+    used = sum(sizes) / SIXTEENTHS_PER_FOOT
+    patterns = Counter(tuple(sorted(stock, reverse=True)) for stock in bins)
+    return CutPlan(
+        stock_length=stock_length,
+        stock_count=len(bins),
+        pieces=len(sizes),
+        used_length=round(used, 2),
+        waste=round(len(bins) * stock_length - used, 2),
+        lower_bound=ceil(sum(sizes) / capacity) if sizes else 0,
+        patterns=[
+            (repeat, [round(size / SIXTEENTHS_PER_FOOT, 4) for size in stock])
+            for stock, repeat in patterns.most_common()
+        ]
+    )
+
+def optimise_materials(
+    results: Iterable[CeilingCalculation],
+    mode: str = 'fast',
+    time_limit: float = 2.0,
+    catalog: MaterialCatalog = DEFAULT_CATALOG
+) -> dict[str, CutPlan]:
+    pieces = required_pieces(results, catalog)
+    return {
+        'main': optimise_cutting(pieces['main'], catalog.rod_length, mode, time_limit),
+        'cross': optimise_cutting(pieces['cross'], catalog.rod_length, mode, time_limit),
+        'l_patti': optimise_cutting(pieces['l_patti'], catalog.l_patti_length, mode, time_limit),
+    }
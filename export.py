@@ -0,0 +1,152 @@
+from typing import Iterable, Optional
+
+import xlsxwriter
+
+from boards import layout_sheet_count
+from project import BillOfMaterials, ProjectRoom, iter_project_calculations
+from utils import CeilingCalculation
+
+SUMMARY_ITEMS = [
+    ('Parameters (Full 12ft)', 'parameters_full'),
+    ('Parameters (Extra Length, ft)', 'parameters_extra'),
+    ('Main Rods', 'main_rods'),
+    ('Cross Rods', 'cross_rods'),
+    ('Full L-Patti (8ft)', 'full_l_patti_count'),
+    ('Cutting L-Patti', 'l_patti_cuts'),
+    ('Connecting Clips', 'connecting_clips'),
+    ('Screws', 'screws'),
+    ('Black Screws (Boxes)', 'black_screws'),
+    ('Fasteners', 'fasteners'),
+    ('Fastener Clips', 'fastener_clips'),
+    ('Full Boards', 'board_count'),
+    ('Extra Board Area (sqft)', 'board_extra_sqft'),
+]
+
+ROOM_COLUMNS = [
+    ('Total Parameter Length (ft)', 'total_parameter_length'),
+    ('Parameters (Full 12ft)', 'parameters_full'),
+    ('Parameters (Extra Length, ft)', 'parameters_extra'),
+    ('Main Rods', 'main_rods'),
+    ('Main Rods Length (ft)', 'main_rods_length'),
+    ('Last Main Length (ft)', 'last_main_length'),
+    ('Extra Main Needed', 'extra_main_needed'),
+    ('Cross Rods', 'cross_rods'),
+    ('Cross Rods Length (ft)', 'cross_rods_length'),
+    ('Last Cross Length (ft)', 'last_cross_length'),
+    ('Full L-Patti (8ft)', 'full_l_patti_count'),
+    ('Cutting L-Patti', 'l_patti_cuts'),
+    ('Remaining Cut L-Patti', 'l_patti_remaining'),
+    ('L-Patti Cut Size (ft)', 'l_patti_cut_size'),
+    ('Connecting Clips', 'connecting_clips'),
+    ('Screws', 'screws'),
+    ('Black Screws (Boxes)', 'black_screws'),
+    ('Fasteners', 'fasteners'),
+    ('Fastener Clips', 'fastener_clips'),
+    ('Full Boards', 'board_count'),
+    ('Extra Board Area (sqft)', 'board_extra_sqft'),
+]
+
+# rows on an Excel sheet, header included
+MAX_SHEET_ROWS = 1_048_576
+
+class _SheetRows:
+    # Rows written top to bottom under a header; once a sheet is full they
+    # carry on in "<title> 2", "<title> 3", ... with the header repeated.
+
+    def __init__(self, workbook, title: str, header: list, header_format, width: float):
+        self.workbook = workbook
+        self.title = title
+        self.header = header
+        self.header_format = header_format
+        self.width = width
+        self.sheets = 0
+        self._add_sheet()
+
+    def _add_sheet(self) -> None:
+        self.sheets += 1
+        self.sheet = self.workbook.add_worksheet(self.title if self.sheets == 1 else f"{self.title} {self.sheets}")
+        self.sheet.set_column(0, len(self.header) - 1, self.width)
+        self.sheet.write_row(0, 0, self.header, self.header_format)
+        self.row = 1
+
+    def next_row(self) -> tuple:
+        # the sheet and row to write the next row to
+        if self.row == MAX_SHEET_ROWS:
+            self._add_sheet()
+        self.row += 1
+        return self.sheet, self.row - 1
+
+def write_workbook(
+    target,
+    rooms: Iterable[tuple[tuple, Optional[CeilingCalculation], Optional[int]]],
+    label_columns: tuple = ('Room',)
+) -> BillOfMaterials:
+    # rooms are (labels, result, sheets from the board layout); a room
+    # without a layout orders its area estimate of boards.
+    # constant_memory flushes each row to a temp file as soon as the next one
+    # starts, so rows must be written top to bottom on every sheet
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True})
+    header = workbook.add_format({'bold': True})
+    feet = workbook.add_format({'num_format': '0.00'})
+
+    summary_sheet = workbook.add_worksheet('Summary')
+    labels = list(label_columns)
+    summary_sheet.set_column(0, 0, 32)
+    rooms_rows = _SheetRows(workbook, 'Rooms', labels + [title for title, _ in ROOM_COLUMNS] + ['Boards (Layout)'], header, 14)
+    cut_rows = _SheetRows(workbook, 'Cut List', labels + ['Rod', 'Rod No.', 'Length (ft)'], header, 14)
+
+    totals = BillOfMaterials()
+    skipped = 0
+    laid_out = False
+    for room_labels, result, board_sheets in rooms:
+        room_labels = list(room_labels)
+        rooms_sheet, room_row = rooms_rows.next_row()
+        if result is None:
+            rooms_sheet.write_row(room_row, 0, room_labels + ['Cannot calculate: check width1 and linter spacing'])
+            skipped += 1
+            continue
+
+        totals.add(result, board_sheets)
+        rooms_sheet.write_row(room_row, 0, room_labels)
+        for column, (_, name) in enumerate(ROOM_COLUMNS, start=len(labels)):
+            rooms_sheet.write(room_row, column, getattr(result, name))
+        if board_sheets is not None:
+            rooms_sheet.write(room_row, len(labels) + len(ROOM_COLUMNS), board_sheets)
+            laid_out = True
+
+        for rod, lengths in (('Main', result.main_lengths), ('Cross', result.cross_lengths)):
+            for number, length in enumerate(lengths, start=1):
+                cuts_sheet, cut_row = cut_rows.next_row()
+                cuts_sheet.write_row(cut_row, 0, room_labels + [rod, number])
+                cuts_sheet.write_number(cut_row, len(labels) + 2, length, feet)
+
+    summary_sheet.write_row(0, 0, ['Item', 'Quantity'], header)
+    row = 1
+    for title, name in SUMMARY_ITEMS:
+        summary_sheet.write(row, 0, title)
+        summary_sheet.write(row, 1, round(getattr(totals, name), 2))
+        row += 1
+    summary_sheet.write_row(row, 0, ['Total Boards (sheet layout)' if laid_out else 'Total Boards (area, room by room)', totals.boards_total])
+    summary_sheet.write_row(row + 1, 0, ['Boards by Area (incl. extra area)', totals.boards_by_area])
+    summary_sheet.write_row(row + 2, 0, ['Rooms', totals.rooms])
+    row += 3
+    if skipped:
+        summary_sheet.write_row(row, 0, ['Rooms Skipped', skipped])
+        row += 1
+    for rows in (rooms_rows, cut_rows):
+        if rows.sheets > 1:
+            summary_sheet.write_row(row, 0, [f"{rows.title} Sheets", rows.sheets])
+            row += 1
+
+    workbook.close()
+    return totals
+
+def project_rows(calculations: Iterable[tuple[ProjectRoom, Optional[CeilingCalculation]]], board_layouts: bool = False):
+    # iter_project_calculations output as write_workbook rows; rooms are only
+    # laid out (about 0.25 ms a new size) when board_layouts is set
+    for room, result in calculations:
+        board_sheets = layout_sheet_count(room.dimensions) if board_layouts and result is not None else None
+        yield (room.floor, room.flat, room.room), result, board_sheets
+
+def write_project_workbook(target, rooms: list[ProjectRoom], board_layouts: bool = False) -> BillOfMaterials:
+    return write_workbook(target, project_rows(iter_project_calculations(rooms), board_layouts), label_columns=('Floor', 'Flat', 'Room'))
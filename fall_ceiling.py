@@ -0,0 +1,193 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from dataclasses import fields
+from itertools import islice
+from typing import Iterable, Iterator
+
+from series import LengthSeries, calculate_ceiling_summary
+from units import FEET_PER_UNIT, UNITS, convert_to_feet
+from utils import CeilingCalculation, RoomDimensions, calculate_ceiling_requirements
+
+DIMENSION_FIELDS = ('length1', 'length2', 'width1', 'width2', 'linter_spacing')
+INPUT_FORMATS = ('ndjson', 'csv')
+LENGTH_FIELDS = ('main_lengths', 'cross_lengths')
+RESULT_FIELDS = tuple(item.name for item in fields(CeilingCalculation))
+FLOAT_FIELDS = tuple(item.name for item in fields(CeilingCalculation) if item.type is float)
+CANNOT_CALCULATE = "room cannot be calculated: width1 must be over 2 ft and linter spacing between 0 and 8 ft"
+
+def read_records(stream, input_format: str) -> Iterator[dict]:
+    if input_format == 'csv':
+        yield from csv.DictReader(stream)
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            yield {'error': f"line {line_number}: invalid JSON ({error.msg})"}
+
+def _normalise_key(key) -> str:
+    return str(key).strip().lower().replace(' ', '_')
+
+def parse_rooms(records: Iterable[dict], default_unit: str) -> Iterator[tuple[dict, RoomDimensions]]:
+    for record in records:
+        if not isinstance(record, dict):
+            yield {'error': "room must be a JSON object"}, None
+            continue
+        if 'error' in record:
+            yield record, None
+            continue
+
+        normalised = {_normalise_key(key): value for key, value in record.items()}
+        unit = normalised.get('unit') or default_unit
+        passthrough = {key: value for key, value in record.items() if _normalise_key(key) not in DIMENSION_FIELDS + ('unit',)}
+        if not isinstance(unit, str) or unit not in FEET_PER_UNIT:
+            yield {**passthrough, 'error': f"unknown unit '{unit}'"}, None
+            continue
+        try:
+            values = [convert_to_feet(float(normalised[name]), unit) for name in DIMENSION_FIELDS]
+        except KeyError as missing:
+            yield {**passthrough, 'error': f"missing field {missing}"}, None
+            continue
+        except (TypeError, ValueError, OverflowError):
+            yield {**passthrough, 'error': "dimensions must be numbers"}, None
+            continue
+
+        yield passthrough, RoomDimensions(*values)
+
+def result_record(result: CeilingCalculation, include_lengths: bool = True) -> dict:
+    values = {name: getattr(result, name) for name in RESULT_FIELDS}
+    for name in FLOAT_FIELDS:
+        values[name] = float(values[name])
+    for name in LENGTH_FIELDS:
+        if not include_lengths:
+            del values[name]
+        elif isinstance(values[name], LengthSeries):
+            # a summary's rods: count lengths of first + step * k
+            values[name] = [{'first': float(run.first), 'step': float(run.step), 'count': run.count} for run in values[name].runs]
+    return values
+
+def calculate_rooms(rooms: Iterable[tuple[dict, RoomDimensions]], include_lengths: bool = True, summary: bool = False) -> Iterator[dict]:
+    # summary reports the rod lengths as runs, in the same time for any size of room
+    calculate = calculate_ceiling_summary if summary else calculate_ceiling_requirements
+    for passthrough, dimensions in rooms:
+        if dimensions is None:
+            yield passthrough
+            continue
+        try:
+            result = calculate(dimensions)
+        except (ArithmeticError, IndexError, ValueError):
+            yield {**passthrough, 'error': CANNOT_CALCULATE}
+            continue
+        yield {**passthrough, **result_record(result, include_lengths)}
+
+def calculate_rooms_batched(rooms: Iterable[tuple[dict, RoomDimensions]], batch_size: int, include_lengths: bool = True) -> Iterator[dict]:
+    from batch import calculate_rooms_batch
+
+    rooms = iter(rooms)
+    while True:
+        chunk = list(islice(rooms, batch_size))
+        if not chunk:
+            return
+
+        calculable = [dimensions for _, dimensions in chunk if dimensions is not None]
+        records = iter(calculate_rooms_batch(calculable).to_dicts() if calculable else [])
+
+        for passthrough, dimensions in chunk:
+            if dimensions is None:
+                yield passthrough
+                continue
+            values = next(records)
+            if values is None:
+                yield {**passthrough, 'error': CANNOT_CALCULATE}
+                continue
+            if not include_lengths:
+                for name in LENGTH_FIELDS:
+                    del values[name]
+            yield {**passthrough, **values}
+
+def write_ndjson(records: Iterable[dict], stream) -> int:
+    errors = 0
+    for record in records:
+        errors += 'error' in record
+        stream.write(json.dumps(record) + '\n')
+    return errors
+
+def _csv_value(value):
+    # rod lengths as 10.00;10.50, and a summary's runs as first+step*count
+    if not isinstance(value, list):
+        return value
+    return ';'.join(f"{item['first']:.2f}+{item['step']:.2f}*{item['count']}" if isinstance(item, dict) else f"{item:.2f}" for item in value)
+
+def write_csv(records: Iterable[dict], stream) -> int:
+    errors = 0
+    writer = None
+    for record in records:
+        errors += 'error' in record
+        row = {key: _csv_value(values) for key, values in record.items()}
+        if writer is None:
+            passthrough = [key for key in row if key not in RESULT_FIELDS and key != 'error']
+            fieldnames = passthrough + [name for name in RESULT_FIELDS if name in row or 'error' in row] + ['error']
+            writer = csv.DictWriter(stream, fieldnames=fieldnames, extrasaction='ignore', restval='')
+            writer.writeheader()
+        writer.writerow(row)
+    return errors
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m fall_ceiling',
+        description='Calculate fall ceiling materials for rooms streamed as NDJSON or CSV.'
+    )
+    parser.add_argument('input', nargs='?', default='-', help="input file, or '-' for stdin (default)")
+    parser.add_argument('--format', choices=INPUT_FORMATS, help='input format (default: from file extension, else ndjson)')
+    parser.add_argument('--output-format', choices=INPUT_FORMATS, default='ndjson', help='output format (default: ndjson)')
+    parser.add_argument('--unit', choices=UNITS, default='ft', help="unit for rows without a 'unit' field (default: ft)")
+    parser.add_argument('--batch-size', type=int, default=0, help='calculate rows in NumPy batches of this size (default: one at a time)')
+    parser.add_argument('--no-lengths', action='store_true', help='leave per-rod main/cross lengths out of the output')
+    parser.add_argument('--summary', action='store_true', help='give rod lengths as runs of first, step and count; fast for halls thousands of feet across')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 if any row could not be calculated')
+    return parser
+
+def main(argv: list[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.summary and args.batch_size > 0:
+        parser.error('--summary calculates one room at a time; leave out --batch-size')
+
+    input_format = args.format
+    if input_format is None:
+        input_format = 'csv' if args.input.lower().endswith('.csv') else 'ndjson'
+
+    if args.input == '-':
+        stream = sys.stdin
+    else:
+        stream = open(args.input, newline='' if input_format == 'csv' else None, encoding='utf-8')
+
+    try:
+        rooms = parse_rooms(read_records(stream, input_format), args.unit)
+        if args.batch_size > 0:
+            records = calculate_rooms_batched(rooms, args.batch_size, not args.no_lengths)
+        else:
+            records = calculate_rooms(rooms, not args.no_lengths, args.summary)
+
+        writer = write_csv if args.output_format == 'csv' else write_ndjson
+        errors = writer(records, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # downstream closed early (e.g. piped into head); stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    return 1 if args.strict and errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
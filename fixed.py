@@ -0,0 +1,231 @@
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from units import TICKS_PER_FOOT, to_ticks
+from utils import CeilingCalculation, RoomDimensions
+
+# Same rules as utils, but every measurement is a whole number of ticks (see
+# units.py). A rod along a sloping wall is generally not a whole number of
+# ticks, so rod lengths are kept scaled by the wall they are spaced along.
+# Every comparison and count is integer arithmetic; floats only appear in the
+# result.
+
+FOOT = TICKS_PER_FOOT
+SQUARE_FOOT = FOOT * FOOT
+
+@dataclass(frozen=True)
+class FixedDimensions:
+    length1: int
+    length2: int
+    width1: int
+    width2: int
+    linter_spacing: int
+
+def fixed_dimensions(dimensions: RoomDimensions) -> FixedDimensions:
+    return FixedDimensions(
+        to_ticks(dimensions.length1),
+        to_ticks(dimensions.length2),
+        to_ticks(dimensions.width1),
+        to_ticks(dimensions.width2),
+        to_ticks(dimensions.linter_spacing)
+    )
+
+@lru_cache(maxsize=256)
+def catalog_ticks(catalog: MaterialCatalog) -> MaterialCatalog:
+    # the same catalog with every size in whole ticks
+    return replace(catalog, **{item.name: to_ticks(getattr(catalog, item.name)) for item in fields(catalog)})
+
+def _feet(ticks: int, scale: int = 1) -> float:
+    # int / int is correctly rounded, however large the operands
+    return ticks / (scale * FOOT)
+
+def _round2(numerator: int, denominator: int) -> float:
+    # round(numerator / denominator, 2) on the exact quotient, half to even
+    hundredths, remainder = divmod(100 * numerator, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and hundredths % 2):
+        hundredths += 1
+    return hundredths / 100
+
+def _round_feet(ticks: int, scale: int = 1) -> float:
+    return _round2(ticks, scale * FOOT)
+
+def calculate_parameters(dimensions: FixedDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, int]:
+    ticks = catalog_ticks(catalog)
+    STANDARD_LENGTH = ticks.parameter_length
+    OVERLAP = ticks.parameter_overlap
+
+    total_perimeter = dimensions.length1 + dimensions.length2 + dimensions.width1 + dimensions.width2
+
+    full_rods = -(-total_perimeter // STANDARD_LENGTH)
+
+    extra_length = 0
+    if total_perimeter > (full_rods * STANDARD_LENGTH):
+        extra_length = total_perimeter - (full_rods * STANDARD_LENGTH)
+        if extra_length > STANDARD_LENGTH:
+            extra_length += OVERLAP
+
+    return full_rods, extra_length
+
+def calculate_main_rods(length1: int, length2: int, width1: int, width2: int, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, list[int], int]:
+    ticks = catalog_ticks(catalog)
+    FIRST_DISTANCE = ticks.first_rod_distance
+    SPACING = ticks.main_spacing
+    STANDARD_LENGTH = ticks.rod_length
+    WALL_THRESHOLD = ticks.main_wall_threshold
+    OVERLAP = ticks.main_overlap
+
+    if width1 <= FIRST_DISTANCE:
+        raise ValueError("width1 must be more than the first rod distance")
+
+    positions = list(range(FIRST_DISTANCE, width1, SPACING))
+    if width1 - positions[-1] >= WALL_THRESHOLD:
+        positions.append(min(width1, positions[-1] + SPACING))
+
+    # the rod at pos is length1 + (length2 - length1) * pos / width1 ticks long;
+    # keep it multiplied by width1 so it stays an integer
+    standard = STANDARD_LENGTH * width1
+    main_lengths = [length1 * width1 + (length2 - length1) * pos for pos in positions]
+
+    extra_length = 0
+    extra_rods_needed = 0
+    for length_at_pos in main_lengths:
+        if length_at_pos > standard:
+            extra_length += length_at_pos - standard
+            extra_rods_needed += -(-(length_at_pos - standard) // standard)
+
+    total_extra_needed = extra_length + extra_rods_needed * OVERLAP * width1
+    return len(positions) + extra_rods_needed, main_lengths, total_extra_needed
+
+def calculate_cross_rods(length1: int, length2: int, width1: int, width2: int, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, list[int]]:
+    ticks = catalog_ticks(catalog)
+    FIRST_DISTANCE = ticks.first_rod_distance
+    SPACING = ticks.cross_spacing
+    MIN_THRESHOLD = ticks.cross_min_threshold
+    MAX_THRESHOLD = ticks.cross_max_threshold
+    STANDARD_LENGTH = ticks.rod_length
+
+    longer_wall = max(length1, length2)
+
+    positions = list(range(FIRST_DISTANCE, longer_wall + 1, SPACING))
+    if positions and (longer_wall - positions[-1]) <= MIN_THRESHOLD:
+        positions.pop()
+    if positions and (longer_wall - positions[-1]) > MAX_THRESHOLD:
+        positions.append(positions[-1] + SPACING)
+
+    # multiplied by longer_wall, as with the main rods
+    cross_lengths = [width1 * longer_wall + (width2 - width1) * pos for pos in positions]
+    num_cross_rods = -(-sum(cross_lengths) // (STANDARD_LENGTH * longer_wall)) if positions else 0
+
+    return num_cross_rods, cross_lengths
+
+def calculate_l_patti(linter_spacing: int, main_lengths: list[int], width1: int, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, int, int]:
+    ticks = catalog_ticks(catalog)
+    L_PATTI_LENGTH = ticks.l_patti_length
+    FIRST_L_PATTI = ticks.first_l_patti
+    SPACING = ticks.l_patti_spacing
+    END_CLEARANCE = ticks.l_patti_end_clearance
+
+    # a main of length L takes floor((L - 1 - 3) / 4) + 1 pieces once L - 1 >= 3
+    reach = (FIRST_L_PATTI + END_CLEARANCE) * width1
+    spacing = SPACING * width1
+    total_l_patti_cuts = sum((length - reach) // spacing + 1 for length in main_lengths if length >= reach)
+
+    # a zero spacing, or one longer than the L-patti, divides by zero just like utils does
+    pieces_per_l_patti = L_PATTI_LENGTH // linter_spacing
+    full_l_patti_needed = -(-total_l_patti_cuts // pieces_per_l_patti)
+    remaining_pieces = full_l_patti_needed * pieces_per_l_patti - total_l_patti_cuts
+
+    return full_l_patti_needed, total_l_patti_cuts, remaining_pieces
+
+def calculate_room_area(dimensions: FixedDimensions) -> int:
+    # four times the area in square ticks, which is always a whole number
+    return (dimensions.length1 + dimensions.length2) * (dimensions.width1 + dimensions.width2)
+
+def calculate_board_requirements(dimensions: FixedDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, float]:
+    ticks = catalog_ticks(catalog)
+    BOARD_AREA = 4 * ticks.board_length * ticks.board_width
+
+    room_area = calculate_room_area(dimensions)
+    full_boards = room_area // BOARD_AREA
+    extra_sqft = _round2(room_area - full_boards * BOARD_AREA, 4 * SQUARE_FOOT)
+
+    return full_boards, extra_sqft
+
+def calculate_fixed_requirements(dimensions: FixedDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    main_rods = calculate_main_rods(
+        dimensions.length1,
+        dimensions.length2,
+        dimensions.width1,
+        dimensions.width2,
+        catalog
+    )
+    cross_rods = calculate_cross_rods(
+        dimensions.length1,
+        dimensions.length2,
+        dimensions.width1,
+        dimensions.width2,
+        catalog
+    )
+
+    return build_calculation(
+        dimensions,
+        calculate_parameters(dimensions, catalog),
+        main_rods,
+        cross_rods,
+        calculate_l_patti(dimensions.linter_spacing, main_rods[1], dimensions.width1, catalog),
+        calculate_board_requirements(dimensions, catalog),
+        calculate_room_area(dimensions)
+    )
+
+def build_calculation(
+    dimensions: FixedDimensions,
+    parameters: tuple[int, int],
+    main_rods: tuple[int, list[int], int],
+    cross_rods: tuple[int, list[int]],
+    l_patti: tuple[int, int, int],
+    boards: tuple[int, float],
+    room_area: int
+) -> CeilingCalculation:
+    params_full, params_extra = parameters
+    main_rods_count, main_lengths, extra_main_needed = main_rods
+    cross_rods_count, cross_lengths = cross_rods
+    full_l_patti, l_patti_cuts, remaining_cuts = l_patti
+    board_count, board_extra_sqft = boards
+
+    total_parameter_length = dimensions.length1 + dimensions.length2 + dimensions.width1 + dimensions.width2
+    black_screw_boxes = -(-room_area // (4 * 1000 * SQUARE_FOOT))
+
+    # rod lengths come back scaled by the wall they are spaced along
+    width1 = dimensions.width1
+    longer_wall = max(dimensions.length1, dimensions.length2)
+
+    return CeilingCalculation(
+        parameters_full=params_full,
+        parameters_extra=_round_feet(params_extra),
+        main_rods=main_rods_count,
+        cross_rods=cross_rods_count,
+        connecting_clips=main_rods_count * cross_rods_count,
+        screws=-(-total_parameter_length // FOOT) * 12,
+        total_parameter_length=_round_feet(total_parameter_length),
+        main_rods_length=_round_feet(sum(main_lengths), width1),
+        cross_rods_length=_round_feet(sum(cross_lengths), longer_wall) if cross_lengths else 0.0,
+        l_patti_count=l_patti_cuts,
+        black_screws=black_screw_boxes,
+        fasteners=l_patti_cuts,
+        fastener_clips=l_patti_cuts,
+        board_count=board_count,
+        board_extra_sqft=board_extra_sqft,
+        full_l_patti_count=full_l_patti,
+        l_patti_cuts=l_patti_cuts,
+        l_patti_remaining=remaining_cuts,
+        l_patti_cut_size=_feet(dimensions.linter_spacing),
+        last_cross_length=_round_feet(cross_lengths[-1], longer_wall) if cross_lengths else 0.0,
+        cross_lengths=[_feet(length, longer_wall) for length in cross_lengths],
+        main_lengths=[_feet(length, width1) for length in main_lengths],
+        last_main_length=_round_feet(main_lengths[-1], width1),
+        extra_main_needed=f"{_round_feet(extra_main_needed, width1):.2f} FT" if extra_main_needed > 0 else ""
+    )
+
+def calculate_ceiling_requirements(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    return calculate_fixed_requirements(fixed_dimensions(dimensions), catalog)
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple, fields, replace
+from fractions import Fraction
+from math import ceil, isclose
+
+import numpy as np
+
+import utils
+from batch import calculate_ceiling_requirements_batch
+from catalog import DEFAULT_CATALOG
+from fixed import FOOT, calculate_ceiling_requirements as calculate_fixed, catalog_ticks
+from graph import CalculationGraph
+from series import LengthSeries, calculate_ceiling_summary, calculate_closed_form_summary
+from units import to_ticks
+from utils import RoomDimensions
+
+# Differential fuzzing of the engines against utils' float pipeline
+# (utils.calculate_float_requirements), the reference:
+#   fixed        the tick engine behind utils.calculate_ceiling_requirements;
+#                must equal the reference, or where float drift lands on a
+#                boundary, the reference run on exact fractions of the same
+#                ticks, which is what the fixed engine promises
+#   batch, graph must equal fixed bit for bit
+#   summary      series.calculate_ceiling_summary, which takes rooms up to
+#                FIXED_UP_TO_FEET from fixed; must equal fixed bit for bit
+#   series       the closed form behind larger summaries, on every room; must
+#                equal the reference on exact fractions on every room, since
+#                it computes from the exact decimal sizes too
+# Every engine must also agree with the reference on which rooms cannot be
+# calculated (width1 of 2 ft or less, linter_spacing of 0 or over 8 ft).
+
+ENGINES = ('batch', 'fixed', 'graph', 'summary', 'series')
+# series is checked exactly on every room, about 3 ms each, so it only runs
+# when asked for
+DEFAULT_ENGINES = ('batch', 'fixed', 'graph', 'summary')
+EXACT_ENGINES = ('fixed',)
+# the same tick arithmetic as fixed, so checked against it directly
+TICK_ENGINES = ('batch', 'graph', 'summary')
+# checked against the exact reference itself, not screened with utils first
+ORACLE_ENGINES = ('series',)
+DEFAULT_ROOMS = 1_000_000
+DEFAULT_CHUNK_SIZE = 20_000
+# how far the exact engines' floats may sit from the float reference's
+FLOAT_TOLERANCE = 1e-9
+# mismatching rooms reported per engine
+MAX_EXAMPLES = 5
+
+# the exact reference for a room, before it has been worked out
+_PENDING = object()
+
+EXACT_CATALOG = replace(
+    DEFAULT_CATALOG,
+    **{item.name: Fraction(getattr(catalog_ticks(DEFAULT_CATALOG), item.name), FOOT) for item in fields(DEFAULT_CATALOG)}
+)
+
+def random_rooms(rng: np.random.Generator, count: int) -> np.ndarray:
+    # (count, 5) rows of length1, length2, width1, width2, linter_spacing,
+    # drawn from a mix of ordinary rooms and the shapes that break things
+    kinds = rng.choice(6, size=count, p=[0.35, 0.15, 0.15, 0.1, 0.15, 0.1])
+    walls = np.empty((count, 4))
+
+    # ordinary rooms, typed to one or two decimals
+    ordinary = kinds == 0
+    walls[ordinary] = np.round(rng.uniform(8, 40, (ordinary.sum(), 4)), rng.integers(1, 3))
+    # halls up to warehouse size
+    halls = kinds == 1
+    walls[halls] = rng.uniform(40, 400, (halls.sum(), 4))
+    # whole and half feet, where rods land exactly on the spacing thresholds
+    grid = kinds == 2
+    walls[grid] = rng.integers(0, 120, (grid.sum(), 4)) / 2
+    # inches, which are not binary fractions of a foot
+    inches = kinds == 3
+    walls[inches] = rng.integers(0, 600, (inches.sum(), 4)) / 12
+    # strongly sloping walls
+    sloped = kinds == 4
+    walls[sloped] = rng.uniform(0, 60, (sloped.sum(), 4))
+    # narrow and zero widths and lengths
+    degenerate = kinds == 5
+    walls[degenerate] = rng.choice([0.0, 0.5, 1.0, 2.0, 2.5, 3.5, 4.0], (degenerate.sum(), 4))
+    mixed = degenerate & (rng.random(count) < 0.5)
+    walls[mixed, :2] = rng.uniform(0, 30, (mixed.sum(), 2))
+
+    # mostly the usual spacings, then zero, over 8 ft (no piece fits in an
+    # L-patti) and arbitrary values
+    linter_spacing = rng.choice([1.5, 2.0, 2.5, 4.0, 8.0, 0.0, 8.5, 9.0, 12.0, 1 / 3, -1], size=count,
+                                p=[0.2, 0.2, 0.15, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.1])
+    arbitrary = linter_spacing == -1
+    linter_spacing[arbitrary] = np.round(rng.uniform(0, 10, arbitrary.sum()), 2)
+    return np.column_stack((walls, linter_spacing))
+
+def _reference(room: RoomDimensions):
+    try:
+        return utils.calculate_float_requirements(room)
+    except Exception:
+        return None
+
+def _exact_reference(room: RoomDimensions):
+    # utils on exact fractions of the room's ticks; only extra_main_needed is
+    # redone, because utils starts that sum from the float 0.0
+    exact = RoomDimensions(*(Fraction(to_ticks(value), FOOT) for value in astuple(room)))
+    try:
+        result = utils.calculate_float_requirements(exact, EXACT_CATALOG)
+    except Exception:
+        return None
+
+    rod = EXACT_CATALOG.rod_length
+    extra = sum(
+        (length - rod) + ceil((length - rod) / rod) * EXACT_CATALOG.main_overlap
+        for length in result.main_lengths
+        if length > rod
+    )
+    result.extra_main_needed = f"{float(round(extra, 2)):.2f} FT" if extra > 0 else ""
+    return result
+
+def _outcome(calculate, room: RoomDimensions):
+    try:
+        return calculate(room)
+    except Exception:
+        return None
+
+def _plain(result) -> dict:
+    # fractions become the nearest float, which is how the engines report
+    # them; series' rod lengths become a plain list
+    def value(item):
+        if isinstance(item, (list, LengthSeries)):
+            return [float(element) for element in item]
+        return item if isinstance(item, (str, int)) else float(item)
+    return {item.name: value(getattr(result, item.name)) for item in fields(result)}
+
+def _same(expected, got, close: bool) -> bool:
+    if isinstance(expected, list):
+        return len(expected) == len(got) and all(_same(a, b, close) for a, b in zip(expected, got))
+    if close and isinstance(expected, float) and isinstance(got, float):
+        return isclose(expected, got, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE)
+    return expected == got
+
+def _differences(expected, got, close: bool = False) -> dict:
+    # close lets floats differ in the last few bits; counts, strings and
+    # anything that lands on a boundary must still match
+    if expected is None or got is None:
+        return {} if expected is got else {'valid': (expected is not None, got is not None)}
+    expected, got = _plain(expected), _plain(got)
+    return {name: (expected[name], got[name]) for name in expected if not _same(expected[name], got[name], close)}
+
+def check_chunk(seed: int, count: int, engines: tuple[str, ...]) -> dict:
+    rooms = random_rooms(np.random.default_rng(seed), count)
+    report = {engine: {'checked': 0, 'invalid': 0, 'float_drift': 0, 'mismatches': 0, 'examples': []} for engine in engines}
+
+    candidates = {}
+    if 'batch' in engines:
+        batch = calculate_ceiling_requirements_batch(*rooms.T)
+        candidates['batch'] = lambda index, room: batch.to_calculation(index) if batch.valid[index] else None
+    if 'fixed' in engines:
+        # worked out once a room below, since batch and graph need it too
+        candidates['fixed'] = None
+    if 'graph' in engines:
+        # a small memo, so neighbouring rooms reuse stages the way edits do
+        graph = CalculationGraph(memo_size=8)
+        candidates['graph'] = lambda index, room: _outcome(graph.calculate, room)
+    if 'summary' in engines:
+        candidates['summary'] = lambda index, room: _outcome(calculate_ceiling_summary, room)
+    if 'series' in engines:
+        candidates['series'] = lambda index, room: _outcome(calculate_closed_form_summary, room)
+
+    needs_fixed = any(engine == 'fixed' or engine in TICK_ENGINES for engine in engines)
+    for index, row in enumerate(rooms.tolist()):
+        room = RoomDimensions(*row)
+        expected = _reference(room)
+        ticks = _outcome(calculate_fixed, room) if needs_fixed else None
+        exact = _PENDING
+        for engine, calculate in candidates.items():
+            got = ticks if engine == 'fixed' else calculate(index, room)
+            counts = report[engine]
+            if engine in TICK_ENGINES:
+                differences = _differences(ticks, got)
+            elif engine in ORACLE_ENGINES:
+                exact = _exact_reference(room) if exact is _PENDING else exact
+                differences = _differences(exact, got)
+            else:
+                differences = _differences(expected, got, close=engine in EXACT_ENGINES)
+            if differences and engine in EXACT_ENGINES:
+                # the exact reference is slow, so it only settles disagreements
+                exact = _exact_reference(room) if exact is _PENDING else exact
+                differences = _differences(exact, got)
+                counts['float_drift'] += not differences
+
+            counts['checked'] += 1
+            counts['invalid'] += expected is None
+            if differences:
+                counts['mismatches'] += 1
+                if len(counts['examples']) < MAX_EXAMPLES:
+                    counts['examples'].append({'room': row, 'differences': differences})
+    return report
+
+def _merge(total: dict, part: dict) -> None:
+    for engine, counts in part.items():
+        merged = total.setdefault(engine, {'checked': 0, 'invalid': 0, 'float_drift': 0, 'mismatches': 0, 'examples': []})
+        for name in ('checked', 'invalid', 'float_drift', 'mismatches'):
+            merged[name] += counts[name]
+        merged['examples'].extend(counts['examples'][:MAX_EXAMPLES - len(merged['examples'])])
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Check the calculation engines against the float reference on random rooms.')
+    parser.add_argument('--rooms', type=int, default=DEFAULT_ROOMS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', default=','.join(DEFAULT_ENGINES), help=f"comma-separated, from {', '.join(ENGINES)} (default: {', '.join(DEFAULT_ENGINES)})")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    engines = tuple(name.strip() for name in args.engines.split(',') if name.strip())
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+
+    # chunk n always draws the same rooms for a given seed, however many workers run
+    sizes = [min(args.chunk_size, args.rooms - start) for start in range(0, args.rooms, args.chunk_size)]
+    seeds = [args.seed * 1_000_003 + number for number in range(len(sizes))]
+
+    started = time.perf_counter()
+    report = {}
+    if args.workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(sizes))) as pool:
+            for part in pool.map(check_chunk, seeds, sizes, [engines] * len(sizes)):
+                _merge(report, part)
+    else:
+        for seed, size in zip(seeds, sizes):
+            _merge(report, check_chunk(seed, size, engines))
+
+    print(json.dumps({'rooms': args.rooms, 'seed': args.seed, 'seconds': round(time.perf_counter() - started, 1), 'engines': report}, indent=2))
+    return 1 if any(counts['mismatches'] for counts in report.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, Iterator
+
+import fixed
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from fixed import FixedDimensions, fixed_dimensions
+from utils import CeilingCalculation, RoomDimensions
+
+DEFAULT_MEMO_SIZE = 64
+WALLS = ('length1', 'length2', 'width1', 'width2')
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    # dimension fields the stage reads itself, and earlier stages it is given;
+    # run(dimensions, catalog, *outputs of the earlier stages)
+    inputs: tuple[str, ...]
+    after: tuple[str, ...]
+    run: Callable
+
+# Stages look fixed.* up when they run, so metrics.enable() still sees them.
+# They are the tick stages behind utils.calculate_ceiling_requirements, so a
+# graph result equals it bit for bit. Main rods never read width2 and L-patti
+# never reads the walls other than width1, so editing those fields reuses the
+# rods already laid out.
+STAGES = (
+    Stage('parameters', WALLS, (), lambda d, c: fixed.calculate_parameters(d, c)),
+    Stage('main_rods', ('length1', 'length2', 'width1'), (),
+          lambda d, c: fixed.calculate_main_rods(d.length1, d.length2, d.width1, d.width2, c)),
+    Stage('cross_rods', WALLS, (),
+          lambda d, c: fixed.calculate_cross_rods(d.length1, d.length2, d.width1, d.width2, c)),
+    Stage('l_patti', ('linter_spacing', 'width1'), ('main_rods',),
+          lambda d, c, main_rods: fixed.calculate_l_patti(d.linter_spacing, main_rods[1], d.width1, c)),
+    Stage('boards', WALLS, (), lambda d, c: fixed.calculate_board_requirements(d, c)),
+    Stage('room_area', WALLS, (), lambda d, c: fixed.calculate_room_area(d)),
+    Stage('result', WALLS + ('linter_spacing',), ('parameters', 'main_rods', 'cross_rods', 'l_patti', 'boards', 'room_area'),
+          lambda d, c, *outputs: fixed.build_calculation(d, *outputs)),
+)
+
+@dataclass
+class StageReuse:
+    evaluations: int = 0
+    reuses: int = 0
+
+    @property
+    def reuse_rate(self) -> float:
+        runs = self.evaluations + self.reuses
+        return self.reuses / runs if runs else 0.0
+
+class CalculationGraph:
+    # A stage's memo key is every dimension field it depends on, directly or
+    # through earlier stages, in whole ticks; an edit only misses the stages
+    # downstream of the field that changed. A graph lays out one catalog, so
+    # the catalog is not part of the key.
+
+    def __init__(
+        self,
+        stages: tuple[Stage, ...] = STAGES,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        catalog: MaterialCatalog = DEFAULT_CATALOG
+    ):
+        if memo_size < 1:
+            raise ValueError("memo_size must be at least 1")
+
+        self.stages = stages
+        self.memo_size = memo_size
+        self.catalog = catalog
+        self._depends_on: dict[str, tuple[str, ...]] = {}
+        for stage in stages:
+            fields = set(stage.inputs)
+            for name in stage.after:
+                if name not in self._depends_on:
+                    raise ValueError(f"stage '{stage.name}' runs after unknown stage '{name}'")
+                fields.update(self._depends_on[name])
+            self._depends_on[stage.name] = tuple(sorted(fields))
+
+        self._memo: dict[str, OrderedDict] = {stage.name: OrderedDict() for stage in stages}
+        self._reuse: dict[str, StageReuse] = {stage.name: StageReuse() for stage in stages}
+
+    def evaluate(self, dimensions: FixedDimensions) -> dict:
+        outputs = {}
+        for stage in self.stages:
+            key = tuple(getattr(dimensions, name) for name in self._depends_on[stage.name])
+            memo = self._memo[stage.name]
+            if key in memo:
+                memo.move_to_end(key)
+                self._reuse[stage.name].reuses += 1
+            else:
+                memo[key] = stage.run(dimensions, self.catalog, *(outputs[name] for name in stage.after))
+                self._reuse[stage.name].evaluations += 1
+                if len(memo) > self.memo_size:
+                    memo.popitem(last=False)
+            outputs[stage.name] = memo[key]
+        return outputs
+
+    def calculate(self, dimensions: RoomDimensions) -> CeilingCalculation:
+        result = self.evaluate(fixed_dimensions(dimensions))['result']
+        # the memo keeps the original, so callers get lists they can edit
+        return replace(result, cross_lengths=list(result.cross_lengths), main_lengths=list(result.main_lengths))
+
+    def what_if(self, base: RoomDimensions, changes: Iterable[dict]) -> Iterator[CeilingCalculation]:
+        # e.g. what_if(room, [{'linter_spacing': s} for s in (1, 1.5, 2)])
+        for change in changes:
+            yield self.calculate(replace(base, **change))
+
+    def stats(self) -> dict[str, StageReuse]:
+        return {name: replace(reuse) for name, reuse in self._reuse.items()}
+
+    def clear(self) -> None:
+        for stage in self.stages:
+            self._memo[stage.name].clear()
+            self._reuse[stage.name] = StageReuse()
@@ -0,0 +1,295 @@
+import hashlib
+import multiprocessing
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from io import BytesIO
+from typing import Any, Callable, Iterable, Optional
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ARTIFACTS = 64
+EXECUTORS = ('thread', 'process')
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+# rooms between progress reports in the built-in tasks
+PROGRESS_EVERY = 500
+
+# Tasks are plain module-level functions so a process pool can pickle them.
+# Each takes a progress(fraction, message) callback and then its arguments.
+TASKS: dict[str, Callable] = {}
+
+def task(name: str):
+    def register(function: Callable) -> Callable:
+        TASKS[name] = function
+        return function
+    return register
+
+@dataclass
+class JobStatus:
+    id: str
+    task: str
+    state: str = 'queued'
+    progress: float = 0.0
+    message: str = ''
+    submitted: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: str = ''
+
+    @property
+    def done(self) -> bool:
+        return self.state in FINISHED_STATES
+
+@dataclass
+class JobStats:
+    submitted: int
+    deduplicated: int
+    failed: int
+    evictions: int
+    pending: int
+    artifacts: int
+
+# set in each worker process by the pool initializer
+_progress_queue = None
+
+def _set_progress_queue(queue) -> None:
+    global _progress_queue
+    _progress_queue = queue
+
+def _run_in_process(job_id: str, name: str, args: tuple) -> Any:
+    def progress(fraction: float, message: str = '') -> None:
+        _progress_queue.put((job_id, fraction, message))
+
+    _progress_queue.put((job_id, None, ''))
+    return TASKS[name](progress, *args)
+
+class JobQueue:
+    # A local stand-in for a job broker: tasks run on a thread or process pool
+    # and report progress back. Submitting a task with the same arguments as
+    # a queued, running or finished job returns that job instead of running
+    # it again, and the last max_artifacts finished results are kept for ttl
+    # seconds.
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        executor: str = 'thread',
+        max_artifacts: int = DEFAULT_MAX_ARTIFACTS,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+        if max_artifacts < 1:
+            raise ValueError("max_artifacts must be at least 1")
+
+        self.executor = executor
+        self.max_artifacts = max_artifacts
+        self.ttl = ttl
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._status: dict[str, JobStatus] = {}
+        self._futures: dict[str, Future] = {}
+        self._keys: dict[tuple, str] = {}
+        self._job_keys: dict[str, tuple] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.failed = 0
+        self.evictions = 0
+
+        if executor == 'process':
+            # spawn, so workers never inherit a copy of the server's threads
+            context = multiprocessing.get_context('spawn')
+            self._progress = context.Queue()
+            self._pool = ProcessPoolExecutor(workers, mp_context=context, initializer=_set_progress_queue, initargs=(self._progress,))
+            self._listener = threading.Thread(target=self._listen, daemon=True)
+            self._listener.start()
+        else:
+            self._pool = ThreadPoolExecutor(workers, thread_name_prefix='ceiling-job')
+
+    def key(self, name: str, args: tuple) -> tuple:
+        # identical arguments pickle identically, however they were built
+        return name, hashlib.sha256(pickle.dumps(args, protocol=4)).hexdigest()
+
+    def submit(self, name: str, *args) -> str:
+        if name not in TASKS:
+            raise ValueError(f"Unknown task '{name}'")
+
+        key = self.key(name, args)
+        with self._lock:
+            self._expire()
+            existing = self._keys.get(key)
+            if existing is not None and self._status[existing].state not in ('failed', 'cancelled'):
+                self.deduplicated += 1
+                return existing
+
+            job_id = uuid.uuid4().hex
+            self._status[job_id] = JobStatus(id=job_id, task=name, submitted=self.clock())
+            self._keys[key] = job_id
+            self._job_keys[job_id] = key
+            self.submitted += 1
+
+        if self.executor == 'process':
+            future = self._pool.submit(_run_in_process, job_id, name, args)
+        else:
+            future = self._pool.submit(self._run_in_thread, job_id, name, args)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda finished: self._finish(job_id, finished))
+        return job_id
+
+    def status(self, job_id: str) -> JobStatus:
+        with self._lock:
+            if job_id not in self._status:
+                raise KeyError(f"No job '{job_id}'")
+            return replace(self._status[job_id])
+
+    def jobs(self) -> list[JobStatus]:
+        with self._lock:
+            return [replace(status) for status in self._status.values()]
+
+    def stats(self) -> JobStats:
+        with self._lock:
+            return JobStats(
+                submitted=self.submitted,
+                deduplicated=self.deduplicated,
+                failed=self.failed,
+                evictions=self.evictions,
+                pending=len(self._status) - len(self._finished),
+                artifacts=len(self._finished)
+            )
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            raise KeyError(f"No job '{job_id}'")
+        return future.result(timeout)
+
+    def cancel(self, job_id: str) -> bool:
+        # only jobs that have not started can be cancelled
+        with self._lock:
+            future = self._futures.get(job_id)
+        return future is not None and future.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        if self.executor == 'process':
+            self._progress.put(None)
+
+    def _run_in_thread(self, job_id: str, name: str, args: tuple) -> Any:
+        self._update(job_id, None, '')
+        return TASKS[name](lambda fraction, message='': self._update(job_id, fraction, message), *args)
+
+    def _listen(self) -> None:
+        while True:
+            update = self._progress.get()
+            if update is None:
+                return
+            self._update(*update)
+
+    def _update(self, job_id: str, fraction: Optional[float], message: str) -> None:
+        # fraction None marks the job as started
+        with self._lock:
+            status = self._status.get(job_id)
+            if status is None or status.done:
+                return
+            if fraction is None:
+                status.state = 'running'
+                status.started = self.clock()
+            else:
+                status.progress = min(max(fraction, 0.0), 1.0)
+                status.message = message
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            status = self._status[job_id]
+            status.finished = self.clock()
+            try:
+                future.result()
+            except CancelledError:
+                status.state = 'cancelled'
+            except Exception as error:
+                status.state = 'failed'
+                status.error = f"{type(error).__name__}: {error}"
+                self.failed += 1
+            else:
+                status.state = 'done'
+                status.progress = 1.0
+            self._finished[job_id] = None
+            self._expire()
+
+    def _expire(self) -> None:
+        # drop the oldest finished jobs past max_artifacts, and any past ttl
+        now = self.clock()
+        for job_id in list(self._finished):
+            too_many = len(self._finished) > self.max_artifacts
+            too_old = self.ttl is not None and now - self._status[job_id].finished > self.ttl
+            if not (too_many or too_old):
+                break
+            del self._finished[job_id]
+            del self._status[job_id]
+            self.evictions += 1
+            del self._futures[job_id]
+            key = self._job_keys.pop(job_id)
+            if self._keys.get(key) == job_id:
+                del self._keys[key]
+
+def _each_with_progress(items: Iterable, total: int, progress: Callable, message: str):
+    # passes items through one at a time, so a generator is never held whole
+    for done, item in enumerate(items, start=1):
+        yield item
+        if done % PROGRESS_EVERY == 0 or done == total:
+            progress(done / total if total else 1.0, f"{message} {done}/{total}")
+
+@task('project')
+def project_task(progress, rooms, board_layouts=False):
+    from project import evaluate_project
+
+    progress(0.0, f"Calculating {len(rooms)} rooms")
+    # one process is enough here; the job pool already runs jobs side by side,
+    # and chunks of PROGRESS_EVERY rooms keep the progress moving
+    return evaluate_project(rooms, workers=1, chunk_size=PROGRESS_EVERY, progress=progress, board_layouts=board_layouts)
+
+@task('cutting_plan')
+def cutting_plan_task(progress, rooms, mode='thorough'):
+    from cutting import optimise_materials
+    from project import iter_project_calculations
+
+    def calculations():
+        for _, calculation in _each_with_progress(iter_project_calculations(rooms), len(rooms), lambda fraction, message: progress(fraction / 2, message), 'Room'):
+            if calculation is not None:
+                yield calculation
+        progress(0.5, 'Optimising cuts')
+
+    return optimise_materials(calculations(), mode=mode)
+
+@task('project_workbook')
+def project_workbook_task(progress, rooms, board_layouts=False):
+    from export import project_rows, write_workbook
+    from project import iter_project_calculations
+
+    buffer = BytesIO()
+    write_workbook(
+        buffer,
+        project_rows(_each_with_progress(iter_project_calculations(rooms), len(rooms), progress, 'Room'), board_layouts),
+        label_columns=('Floor', 'Flat', 'Room')
+    )
+    return buffer.getvalue()
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
@@ -0,0 +1,130 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+def random_room(rng: random.Random) -> dict:
+    return {
+        'length1': round(rng.uniform(9, 30), 1),
+        'length2': round(rng.uniform(9, 30), 1),
+        'width1': round(rng.uniform(9, 30), 1),
+        'width2': round(rng.uniform(9, 30), 1),
+        'linter_spacing': rng.choice([1.5, 2, 2.5]),
+        'unit': 'ft'
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_local_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, 'api.py'],
+        env={**os.environ, 'PORT': str(port)},
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('local API server did not start')
+
+def run(url: str, requests: int, concurrency: int, batch_size: int, distinct: int, seed: int) -> dict:
+    target = urlsplit(url)
+    rng = random.Random(seed)
+    rooms = [random_room(rng) for _ in range(distinct)]
+    if batch_size:
+        path = '/calculate/batch'
+        bodies = [json.dumps({'rooms': rng.sample(rooms, min(batch_size, len(rooms)))}) for _ in range(min(requests, 64))]
+    else:
+        path = '/calculate'
+        bodies = [json.dumps(room) for room in rooms]
+
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(number: int) -> None:
+        nonlocal errors
+        if not hasattr(local, 'connection'):
+            local.connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        started = time.perf_counter()
+        try:
+            local.connection.request('POST', path, bodies[number % len(bodies)], {'Content-Type': 'application/json'})
+            response = local.connection.getresponse()
+            response.read()
+            failed = response.status != 200
+        except OSError:
+            local.connection.close()
+            failed = True
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(requests)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    def percentile(value):
+        return round(1000 * latencies[min(len(latencies) - 1, int(value * len(latencies)))], 2)
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'seconds': round(duration, 3),
+        'requests_per_second': round(requests / duration, 1),
+        'rooms_per_second': round(requests * (batch_size or 1) / duration, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+    }
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the ceiling calculator JSON API.')
+    parser.add_argument('--url', help='base URL of a running API (default: start one locally)')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--batch-size', type=int, default=0, help='rooms per /calculate/batch request (default: use /calculate)')
+    parser.add_argument('--distinct', type=int, default=200, help='number of distinct room sizes to cycle through')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        server = start_local_server(port)
+        url = f'http://127.0.0.1:{port}'
+
+    try:
+        report = run(url, args.requests, args.concurrency, args.batch_size, args.distinct, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps(report, indent=2))
+    return 1 if report['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
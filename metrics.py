@@ -0,0 +1,146 @@
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import wraps
+
+import fixed
+import utils
+from cache import get_cache
+
+# The engines look their stages up as module globals on every call, so
+# enable() swaps in timed wrappers and disable() puts the originals back.
+# While disabled nothing is wrapped and the stages run at full speed.
+STAGES = {
+    utils: (
+        'calculate_parameters',
+        'calculate_main_rods',
+        'calculate_cross_rods',
+        'calculate_l_patti',
+        'calculate_board_requirements',
+        'calculate_room_area',
+    ),
+    fixed: (
+        'calculate_parameters',
+        'calculate_main_rods',
+        'calculate_cross_rods',
+        'calculate_l_patti',
+        'calculate_board_requirements',
+        'calculate_room_area',
+    ),
+}
+
+# stages that return (count, lengths, ...): record how many lengths they build
+LENGTH_STAGES = {'calculate_main_rods': 'main', 'calculate_cross_rods': 'cross'}
+
+@dataclass
+class StageStats:
+    engine: str
+    stage: str
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    lengths: int = 0
+    max_lengths: int = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+_lock = threading.Lock()
+_originals: dict[tuple, object] = {}
+_stats: dict[tuple, StageStats] = {
+    (module.__name__, name): StageStats(module.__name__, name)
+    for module, names in STAGES.items()
+    for name in names
+}
+
+def _timed(stats: StageStats, function):
+    counts_lengths = stats.stage in LENGTH_STAGES
+
+    @wraps(function)
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        with _lock:
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if counts_lengths:
+                stats.lengths += len(result[1])
+                stats.max_lengths = max(stats.max_lengths, len(result[1]))
+        return result
+
+    return timed
+
+def enabled() -> bool:
+    return bool(_originals)
+
+def enable() -> None:
+    with _lock:
+        if _originals:
+            return
+        for module, names in STAGES.items():
+            for name in names:
+                original = getattr(module, name)
+                _originals[module.__name__, name] = original
+                setattr(module, name, _timed(_stats[module.__name__, name], original))
+
+def disable() -> None:
+    with _lock:
+        if not _originals:
+            return
+        for module, names in STAGES.items():
+            for name in names:
+                setattr(module, name, _originals.pop((module.__name__, name)))
+
+def reset() -> None:
+    with _lock:
+        for stats in _stats.values():
+            stats.calls = stats.lengths = stats.max_lengths = 0
+            stats.seconds = stats.max_seconds = 0.0
+
+def snapshot() -> dict:
+    with _lock:
+        stages = [{**asdict(stats), 'mean_seconds': stats.mean_seconds} for stats in _stats.values()]
+    cache = get_cache().stats()
+    return {
+        'enabled': enabled(),
+        'stages': stages,
+        'cache': {**asdict(cache), 'hit_rate': cache.hit_rate},
+    }
+
+def prometheus_text() -> str:
+    values = snapshot()
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {value!r}" for labels, value in samples)
+
+    def stage_labels(stage: dict) -> str:
+        return f'{{engine="{stage["engine"]}",stage="{stage["stage"]}"}}'
+
+    stages = values['stages']
+    metric('ceiling_stage_calls_total', 'counter', 'Calls to each calculation stage.',
+           [(stage_labels(stage), stage['calls']) for stage in stages])
+    metric('ceiling_stage_seconds_total', 'counter', 'Time spent in each calculation stage.',
+           [(stage_labels(stage), stage['seconds']) for stage in stages])
+    metric('ceiling_stage_seconds_max', 'gauge', 'Slowest single call of each calculation stage.',
+           [(stage_labels(stage), stage['max_seconds']) for stage in stages])
+
+    rod_stages = [stage for stage in stages if stage['stage'] in LENGTH_STAGES]
+    metric('ceiling_rod_lengths_total', 'counter', 'Rod lengths generated by the main and cross rod stages.',
+           [(f'{{engine="{stage["engine"]}",rods="{LENGTH_STAGES[stage["stage"]]}"}}', stage['lengths']) for stage in rod_stages])
+    metric('ceiling_rod_lengths_max', 'gauge', 'Most rod lengths generated for a single room.',
+           [(f'{{engine="{stage["engine"]}",rods="{LENGTH_STAGES[stage["stage"]]}"}}', stage['max_lengths']) for stage in rod_stages])
+
+    cache = values['cache']
+    for name in ('hits', 'misses', 'evictions', 'expirations'):
+        metric(f'ceiling_cache_{name}_total', 'counter', f'Result cache {name}.', [('', cache[name])])
+    metric('ceiling_cache_size', 'gauge', 'Results held in the cache.', [('', cache['size'])])
+    metric('ceiling_cache_hit_ratio', 'gauge', 'Share of cache lookups that were hits.', [('', cache['hit_rate'])])
+    metric('ceiling_metrics_enabled', 'gauge', 'Whether stage timing is switched on.', [('', int(values['enabled']))])
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field
+from fractions import Fraction
+from math import ceil, floor, fsum, hypot
+from typing import Iterator
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from fixed import FOOT, SQUARE_FOOT, catalog_ticks
+from units import to_ticks
+from utils import CeilingCalculation
+
+Point = tuple[float, float]
+
+@dataclass
+class PolygonRoom:
+    # vertices in feet, in order around the wall; main rods run along x and are
+    # spaced along y, cross rods the other way round, as in RoomDimensions
+    outline: list[Point]
+    linter_spacing: float
+    holes: list[list[Point]] = field(default_factory=list)
+
+def _ring(points: list[Point]) -> list[tuple[int, int]]:
+    if len(points) < 3:
+        raise ValueError("a polygon needs at least 3 vertices")
+    return [(to_ticks(x), to_ticks(y)) for x, y in points]
+
+def _edges(rings: list[list[tuple[int, int]]]) -> Iterator[tuple[tuple[int, int], tuple[int, int]]]:
+    for ring in rings:
+        yield from zip(ring, ring[1:] + ring[:1])
+
+def _sweep(edges: list[tuple[int, int, int, int]], positions: list[int]) -> Iterator[list[Fraction]]:
+    # edges are (low, high, across_at_low, across_at_high) along the sweep axis.
+    # An edge is active over (low, high], so a line through a vertex meets the
+    # outline an even number of times and a line along a wall takes the room
+    # just below it. Positions ascend, so each edge enters and leaves once.
+    edges = sorted(edges)
+    active = []
+    entering = 0
+    for position in positions:
+        while entering < len(edges) and edges[entering][0] < position:
+            active.append(edges[entering])
+            entering += 1
+        active = [edge for edge in active if edge[1] >= position]
+
+        crossings = sorted(
+            Fraction(start * (high - low) + (position - low) * (end - start), high - low)
+            for low, high, start, end in active
+        )
+        yield [
+            crossings[index + 1] - crossings[index]
+            for index in range(0, len(crossings) - 1, 2)
+            if crossings[index + 1] > crossings[index]
+        ]
+
+def _sweep_edges(rings: list[list[tuple[int, int]]], axis: int) -> list[tuple[int, int, int, int]]:
+    edges = []
+    for first, second in _edges(rings):
+        if first[axis] == second[axis]:
+            continue
+        low, high = sorted((first, second), key=lambda point: point[axis])
+        edges.append((low[axis], high[axis], low[1 - axis], high[1 - axis]))
+    return edges
+
+def main_rod_positions(low: int, high: int, catalog: MaterialCatalog = DEFAULT_CATALOG) -> list[int]:
+    ticks = catalog_ticks(catalog)
+    FIRST_DISTANCE = ticks.first_rod_distance
+    SPACING = ticks.main_spacing
+    WALL_THRESHOLD = ticks.main_wall_threshold
+
+    if high - low <= FIRST_DISTANCE:
+        raise ValueError("the room must be more than the first rod distance across")
+
+    positions = list(range(low + FIRST_DISTANCE, high, SPACING))
+    if high - positions[-1] >= WALL_THRESHOLD:
+        positions.append(min(high, positions[-1] + SPACING))
+    return positions
+
+def cross_rod_positions(low: int, high: int, catalog: MaterialCatalog = DEFAULT_CATALOG) -> list[int]:
+    ticks = catalog_ticks(catalog)
+    FIRST_DISTANCE = ticks.first_rod_distance
+    SPACING = ticks.cross_spacing
+    MIN_THRESHOLD = ticks.cross_min_threshold
+    MAX_THRESHOLD = ticks.cross_max_threshold
+
+    positions = list(range(low + FIRST_DISTANCE, high + 1, SPACING))
+    if positions and (high - positions[-1]) <= MIN_THRESHOLD:
+        positions.pop()
+    if positions and (high - positions[-1]) > MAX_THRESHOLD:
+        positions.append(positions[-1] + SPACING)
+    return positions
+
+def rod_segments(room: PolygonRoom, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[list[list[Fraction]], list[list[Fraction]]]:
+    # exact lengths, in ticks, of every main and cross rod piece that falls
+    # inside the room, one list per rod line
+    rings = [_ring(room.outline)] + [_ring(hole) for hole in room.holes]
+    xs = [x for x, _ in rings[0]]
+    ys = [y for _, y in rings[0]]
+
+    main_lines = list(_sweep(_sweep_edges(rings, 1), main_rod_positions(min(ys), max(ys), catalog)))
+    cross_lines = list(_sweep(_sweep_edges(rings, 0), cross_rod_positions(min(xs), max(xs), catalog)))
+    return main_lines, cross_lines
+
+def polygon_perimeter(room: PolygonRoom) -> float:
+    # walls plus the faces of every column or duct, which need parameters too
+    rings = [_ring(room.outline)] + [_ring(hole) for hole in room.holes]
+    return fsum(hypot(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in _edges(rings)) / FOOT
+
+def polygon_area(room: PolygonRoom) -> Fraction:
+    # shoelace in whole square ticks, so the area is exact
+    def twice_area(ring):
+        return abs(sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in _edges([ring])))
+
+    outline = twice_area(_ring(room.outline))
+    holes = sum(twice_area(_ring(hole)) for hole in room.holes)
+    return Fraction(outline - holes, 2 * SQUARE_FOOT)
+
+def _feet(ticks: Fraction) -> float:
+    return float(ticks / FOOT)
+
+def _round_feet(ticks: Fraction) -> float:
+    return float(round(ticks / FOOT, 2))
+
+def calculate_polygon_requirements(room: PolygonRoom, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    ticks = catalog_ticks(catalog)
+    STANDARD_LENGTH = ticks.rod_length
+    MAIN_OVERLAP = ticks.main_overlap
+    L_PATTI_LENGTH = ticks.l_patti_length
+    FIRST_L_PATTI = ticks.first_l_patti
+    L_PATTI_SPACING = ticks.l_patti_spacing
+    END_CLEARANCE = ticks.l_patti_end_clearance
+    # perimeter and area are already in feet
+    PARAMETER_LENGTH = catalog.parameter_length
+    BOARD_AREA = Fraction(ticks.board_length * ticks.board_width, SQUARE_FOOT)
+
+    main_lines, cross_lines = rod_segments(room, catalog)
+    main_lengths = [length for line in main_lines for length in line]
+    cross_lengths = [length for line in cross_lines for length in line]
+    if not main_lengths:
+        raise ValueError("no main rod falls inside the room")
+
+    total_extra_needed = Fraction(0)
+    extra_rods_needed = 0
+    for length in main_lengths:
+        if length > STANDARD_LENGTH:
+            additional_rods_needed = ceil((length - STANDARD_LENGTH) / STANDARD_LENGTH)
+            total_extra_needed += length - STANDARD_LENGTH + additional_rods_needed * MAIN_OVERLAP
+            extra_rods_needed += additional_rods_needed
+    main_rods_count = len(main_lengths) + extra_rods_needed
+
+    cross_total = sum(cross_lengths, Fraction(0))
+    cross_rods_count = ceil(cross_total / STANDARD_LENGTH)
+
+    # every main piece carries its own hangers: 3 ft in, then every 4 ft, 1 ft clear of the end
+    l_patti_cuts = sum(
+        floor((length - END_CLEARANCE - FIRST_L_PATTI) / L_PATTI_SPACING) + 1
+        for length in main_lengths
+        if length - END_CLEARANCE >= FIRST_L_PATTI
+    )
+    linter_spacing = to_ticks(room.linter_spacing)
+    pieces_per_l_patti = L_PATTI_LENGTH // linter_spacing
+    full_l_patti = ceil(Fraction(l_patti_cuts, pieces_per_l_patti))
+
+    perimeter = polygon_perimeter(room)
+    area = polygon_area(room)
+    board_count = floor(area / BOARD_AREA)
+
+    return CeilingCalculation(
+        parameters_full=ceil(perimeter / PARAMETER_LENGTH),
+        parameters_extra=0.0,
+        main_rods=main_rods_count,
+        cross_rods=cross_rods_count,
+        connecting_clips=main_rods_count * cross_rods_count,
+        screws=ceil(perimeter) * 12,
+        total_parameter_length=round(perimeter, 2),
+        main_rods_length=_round_feet(sum(main_lengths, Fraction(0))),
+        cross_rods_length=_round_feet(cross_total),
+        l_patti_count=l_patti_cuts,
+        black_screws=ceil(area / 1000),
+        fasteners=l_patti_cuts,
+        fastener_clips=l_patti_cuts,
+        board_count=board_count,
+        board_extra_sqft=float(round(area - board_count * BOARD_AREA, 2)),
+        full_l_patti_count=full_l_patti,
+        l_patti_cuts=l_patti_cuts,
+        l_patti_remaining=full_l_patti * pieces_per_l_patti - l_patti_cuts,
+        l_patti_cut_size=linter_spacing / FOOT,
+        last_cross_length=_round_feet(cross_lengths[-1]) if cross_lengths else 0.0,
+        cross_lengths=[_feet(length) for length in cross_lengths],
+        main_lengths=[_feet(length) for length in main_lengths],
+        last_main_length=_round_feet(main_lengths[-1]),
+        extra_main_needed=f"{_round_feet(total_extra_needed):.2f} FT" if total_extra_needed > 0 else ""
+    )
@@ -0,0 +1,298 @@
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from utils import CeilingCalculation
+
+# what a supplier sells, by the name the calculator counts it under;
+# boards are the whole sheets of the board layout where the results carry
+# one (board_sheets), otherwise the area estimate including the extra area
+MATERIALS = (
+    'parameters_full',
+    'main_rods',
+    'cross_rods',
+    'full_l_patti_count',
+    'connecting_clips',
+    'screws',
+    'black_screws',
+    'fasteners',
+    'fastener_clips',
+    'boards',
+)
+PRICE_COLUMNS = ('supplier', 'material', 'unit_price', 'min_quantity')
+
+@dataclass
+class PriceTable:
+    # One row per price tier, sorted by material, supplier and min_quantity.
+    # A tier's unit price applies to the whole order once the quantity reaches
+    # min_quantity; smaller orders pay the supplier's lowest tier.
+    suppliers: list[str]
+    material: np.ndarray
+    supplier: np.ndarray
+    min_quantity: np.ndarray
+    unit_price: np.ndarray
+    # rows of each (material, supplier) pair are group_start[m, s]:group_end[m, s]
+    group_start: np.ndarray = field(init=False, repr=False)
+    group_end: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        keys = self.material * len(self.suppliers) + self.supplier
+        groups = np.arange(len(MATERIALS) * len(self.suppliers))
+        self.group_start = np.searchsorted(keys, groups, side='left').reshape(len(MATERIALS), -1)
+        self.group_end = np.searchsorted(keys, groups, side='right').reshape(len(MATERIALS), -1)
+
+    def __len__(self) -> int:
+        return len(self.unit_price)
+
+    def offers(self, material: str) -> list[str]:
+        index = MATERIALS.index(material)
+        return [name for column, name in enumerate(self.suppliers) if self.group_end[index, column] > self.group_start[index, column]]
+
+    def unit_prices(self, material: str, supplier: str, quantities: np.ndarray) -> np.ndarray:
+        # tier price for each order quantity; NaN where the supplier does not sell it
+        start = self.group_start[MATERIALS.index(material), self.suppliers.index(supplier)]
+        end = self.group_end[MATERIALS.index(material), self.suppliers.index(supplier)]
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if start == end:
+            return np.full(quantities.shape, np.nan)
+
+        tier = np.searchsorted(self.min_quantity[start:end], quantities, side='right') - 1
+        return self.unit_price[start:end][np.maximum(tier, 0)]
+
+def build_price_table(rows: list[dict]) -> PriceTable:
+    suppliers = sorted({str(row['supplier']) for row in rows})
+    records = []
+    for line, row in enumerate(rows, start=1):
+        material = str(row['material']).strip()
+        if material not in MATERIALS:
+            raise ValueError(f"Price row {line}: unknown material '{material}'")
+        try:
+            unit_price = float(row['unit_price'])
+            min_quantity = float(row.get('min_quantity') or 0)
+        except (TypeError, ValueError):
+            raise ValueError(f"Price row {line}: unit_price and min_quantity must be numbers") from None
+        if not (unit_price >= 0 and min_quantity >= 0):
+            raise ValueError(f"Price row {line}: prices and quantities cannot be negative")
+        records.append((MATERIALS.index(material), suppliers.index(str(row['supplier'])), min_quantity, unit_price))
+
+    records.sort()
+    for previous, current in zip(records, records[1:]):
+        if previous[:3] == current[:3]:
+            raise ValueError(f"Two prices for {MATERIALS[current[0]]} from {suppliers[current[1]]} at {current[2]:g} units")
+
+    columns = np.array(records, dtype=np.float64).reshape(-1, 4).T
+    return PriceTable(
+        suppliers=suppliers,
+        material=columns[0].astype(np.int64),
+        supplier=columns[1].astype(np.int64),
+        min_quantity=columns[2],
+        unit_price=columns[3]
+    )
+
+def _price_rows(source, file_format: str = None, supplier: str = None) -> list[dict]:
+    name = source if isinstance(source, (str, Path)) else getattr(source, 'name', '')
+    file_format = file_format or Path(str(name)).suffix.lower().lstrip('.') or 'csv'
+    if file_format not in ('csv', 'json'):
+        raise ValueError(f"Unsupported price list format '{file_format}'")
+
+    if isinstance(source, (str, Path)):
+        with open(source, encoding='utf-8-sig') as handle:
+            text = handle.read()
+    else:
+        data = source.read()
+        text = data.decode('utf-8-sig') if isinstance(data, bytes) else data
+
+    if file_format == 'json':
+        payload = json.loads(text)
+        # either a list of rows, or {"supplier": ..., "prices": [rows]}
+        if isinstance(payload, dict):
+            supplier = payload.get('supplier', supplier)
+            payload = payload.get('prices', [])
+        rows = payload
+    else:
+        rows = [
+            {str(key).strip().lower().replace(' ', '_'): value for key, value in row.items() if key is not None}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+
+    for line, row in enumerate(rows, start=1):
+        if supplier is not None and not row.get('supplier'):
+            row['supplier'] = supplier
+        missing = [column for column in ('supplier', 'material', 'unit_price') if row.get(column) in (None, '')]
+        if missing:
+            raise ValueError(f"Price row {line} of {name or file_format}: missing {', '.join(missing)}")
+    return rows
+
+def load_price_lists(*sources, file_format: str = None) -> PriceTable:
+    # each source is a path or file of CSV or JSON rows; a file without a
+    # supplier column is taken to be one supplier's list, named after the file
+    rows = []
+    for source in sources:
+        name = source if isinstance(source, (str, Path)) else getattr(source, 'name', '')
+        rows.extend(_price_rows(source, file_format, Path(str(name)).stem or None))
+    return build_price_table(rows)
+
+def material_quantities(results, catalog: MaterialCatalog = DEFAULT_CATALOG) -> dict[str, np.ndarray]:
+    # one column per material from a BatchCalculation, a dict of columns
+    # (ProjectResult.room_totals), or a single result or bill of materials
+    def column(name):
+        values = results[name] if isinstance(results, dict) else getattr(results, name)
+        return np.atleast_1d(np.asarray(values, dtype=np.float64))
+
+    quantities = {name: column(name) for name in MATERIALS if name != 'boards'}
+    if (results.get('board_sheets') if isinstance(results, dict) else getattr(results, 'board_sheets', None)) is not None:
+        quantities['boards'] = column('board_sheets')
+    else:
+        quantities['boards'] = column('board_count') + np.ceil(column('board_extra_sqft') / catalog.board_area)
+
+    valid = getattr(results, 'valid', None)
+    if valid is not None:
+        quantities = {name: np.where(valid, values, 0.0) for name, values in quantities.items()}
+    return quantities
+
+def group_quantities(quantities: dict[str, np.ndarray], groups) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    # totals per group (e.g. per project), so bulk tiers apply to whole orders
+    labels, inverse = np.unique(np.asarray(groups), return_inverse=True)
+    return labels, {name: np.bincount(inverse, weights=values, minlength=len(labels)) for name, values in quantities.items()}
+
+@dataclass
+class CostLine:
+    material: str
+    supplier: str
+    quantity: float
+    unit_price: float
+    cost: float
+
+@dataclass
+class CostBreakdown:
+    lines: list[CostLine]
+    # materials needed that no supplier in the table sells
+    unpriced: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return round(sum(line.cost for line in self.lines), 2)
+
+    def by_material(self) -> dict[str, float]:
+        return {line.material: line.cost for line in self.lines}
+
+    def by_supplier(self) -> dict[str, float]:
+        totals: dict[str, float] = {}
+        for line in self.lines:
+            totals[line.supplier] = round(totals.get(line.supplier, 0.0) + line.cost, 2)
+        return totals
+
+@dataclass
+class BatchCosts:
+    # one row per order (room or group), one column per material in MATERIALS
+    suppliers: list[str]
+    quantity: np.ndarray
+    unit_price: np.ndarray
+    cost: np.ndarray
+    # index into suppliers of the supplier chosen, -1 where nothing is bought
+    supplier: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.cost.sum(axis=1)
+
+    @property
+    def unpriced(self) -> np.ndarray:
+        # needed but sold by no supplier in the table, so missing from cost
+        return (self.supplier < 0) & (self.quantity > 0)
+
+    @property
+    def complete(self) -> np.ndarray:
+        # orders whose total covers every material they need
+        return ~self.unpriced.any(axis=1)
+
+    def unpriced_quantities(self) -> dict[str, float]:
+        # what the totals leave out, summed over every order
+        totals = np.where(self.unpriced, self.quantity, 0.0).sum(axis=0)
+        return {name: float(total) for name, total in zip(MATERIALS, totals) if total > 0}
+
+    def by_material(self) -> dict[str, float]:
+        return {name: round(float(total), 2) for name, total in zip(MATERIALS, self.cost.sum(axis=0))}
+
+    def by_supplier(self) -> dict[str, float]:
+        bought = self.supplier >= 0
+        totals = np.bincount(self.supplier[bought], weights=self.cost[bought], minlength=len(self.suppliers))
+        return {name: round(float(total), 2) for name, total in zip(self.suppliers, totals)}
+
+    def breakdown(self, index: int) -> CostBreakdown:
+        lines = []
+        unpriced = []
+        for column, material in enumerate(MATERIALS):
+            quantity = self.quantity[index, column]
+            if quantity == 0:
+                continue
+            if self.supplier[index, column] < 0:
+                unpriced.append(material)
+                continue
+            lines.append(CostLine(
+                material=material,
+                supplier=self.suppliers[self.supplier[index, column]],
+                quantity=float(quantity),
+                unit_price=float(self.unit_price[index, column]),
+                cost=float(self.cost[index, column])
+            ))
+        return CostBreakdown(lines=lines, unpriced=unpriced)
+
+def price_quantities(quantities: dict[str, np.ndarray], table: PriceTable, supplier: str = None) -> BatchCosts:
+    # Each material goes to the supplier that is cheapest at the quantity
+    # ordered, or to `supplier` alone. Loops run over materials and suppliers,
+    # never over orders.
+    if supplier is not None and supplier not in table.suppliers:
+        raise ValueError(f"No price list from supplier '{supplier}'")
+
+    orders = len(next(iter(quantities.values()))) if quantities else 0
+    quantity = np.column_stack([np.broadcast_to(quantities.get(name, 0.0), orders) for name in MATERIALS]).astype(np.float64)
+    unit_price = np.full(quantity.shape, np.nan)
+    chosen = np.full(quantity.shape, -1, dtype=np.int64)
+
+    candidates = table.suppliers if supplier is None else [supplier]
+    for column, material in enumerate(MATERIALS):
+        best_cost = np.full(orders, np.inf)
+        for name in candidates:
+            prices = table.unit_prices(material, name, quantity[:, column])
+            cost = np.where(np.isnan(prices), np.inf, prices * quantity[:, column])
+            cheaper = cost < best_cost
+            best_cost[cheaper] = cost[cheaper]
+            unit_price[cheaper, column] = prices[cheaper]
+            chosen[cheaper, column] = table.suppliers.index(name)
+
+    chosen[quantity == 0] = -1
+    cost = np.where(chosen >= 0, np.round(np.nan_to_num(unit_price) * quantity, 2), 0.0)
+    return BatchCosts(suppliers=table.suppliers, quantity=quantity, unit_price=unit_price, cost=cost, supplier=chosen)
+
+def price_batch(
+    results,
+    table: PriceTable,
+    supplier: str = None,
+    groups=None,
+    catalog: MaterialCatalog = DEFAULT_CATALOG
+) -> Union[BatchCosts, tuple[np.ndarray, BatchCosts]]:
+    # prices every room of a BatchCalculation (or room_totals columns); with
+    # groups, one label per room, returns (labels, costs per group) instead
+    quantities = material_quantities(results, catalog)
+    if groups is None:
+        return price_quantities(quantities, table, supplier)
+    labels, totals = group_quantities(quantities, groups)
+    return labels, price_quantities(totals, table, supplier)
+
+def price_result(
+    result: CeilingCalculation,
+    table: PriceTable,
+    supplier: str = None,
+    catalog: MaterialCatalog = DEFAULT_CATALOG
+) -> CostBreakdown:
+    return price_quantities(material_quantities(result, catalog), table, supplier).breakdown(0)
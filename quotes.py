@@ -0,0 +1,176 @@
+from dataclasses import astuple, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from batch import BatchCalculation
+from compact import (
+    LENGTH_COLUMNS,
+    RESULT_DTYPE,
+    CompactCalculation,
+    ResultArchive,
+    ResultColumns,
+    columns_from_batch,
+    columns_from_results,
+    decode_results,
+    write_archive,
+)
+from fixed import fixed_dimensions
+from units import TICKS_PER_FOOT
+from utils import CeilingCalculation, RoomDimensions
+
+DIMENSION_FIELDS = ('length1', 'length2', 'width1', 'width2', 'linter_spacing')
+# each archived result carries the room it was for, in ticks, a hash of
+# those ticks to search on, and the day it was quoted
+QUOTE_COLUMNS = [('key', '<u8')] + [(name, '<i8') for name in DIMENSION_FIELDS] + [('quoted_on', '<M8[D]')]
+QUOTE_DTYPE = np.dtype(RESULT_DTYPE.descr + LENGTH_COLUMNS + QUOTE_COLUMNS)
+SEGMENT_PATTERN = 'quotes-*.arc'
+
+@dataclass
+class Quote:
+    quoted_on: date
+    dimensions: RoomDimensions
+    result: CompactCalculation
+
+def dimension_keys(ticks: np.ndarray) -> np.ndarray:
+    # FNV-1a over the five tick counts of each row; equal rooms share a key
+    keys = np.full(len(ticks), 0xcbf29ce484222325, dtype=np.uint64)
+    for column in np.asarray(ticks, dtype=np.int64).reshape(-1, len(DIMENSION_FIELDS)).T:
+        keys = (keys ^ column.astype(np.uint64)) * np.uint64(0x100000001b3)
+    return keys
+
+def _room_ticks(rooms: Iterable[RoomDimensions]) -> np.ndarray:
+    return np.array([astuple(fixed_dimensions(room)) for room in rooms], dtype=np.int64).reshape(-1, len(DIMENSION_FIELDS))
+
+def _quote_records(columns: ResultColumns, ticks: np.ndarray, quoted_on: date) -> ResultColumns:
+    records = np.zeros(len(columns.records), dtype=QUOTE_DTYPE)
+    for name in columns.records.dtype.names:
+        records[name] = columns.records[name]
+    for index, name in enumerate(DIMENSION_FIELDS):
+        records[name] = ticks[:, index]
+    records['key'] = dimension_keys(ticks)
+    records['quoted_on'] = np.datetime64(quoted_on, 'D')
+    return ResultColumns(records, columns.lengths)
+
+def _sorted(parts: list[ResultColumns]) -> ResultColumns:
+    # segments are sorted by key, then date, so a lookup is a binary search
+    columns = ResultColumns.concatenate(parts)
+    return columns.take(np.lexsort((columns.records['quoted_on'], columns.records['key'])))
+
+class QuoteStore:
+    # Past quotes on disk as a directory of memory-mapped archive segments.
+    # add() buffers in memory and flush() writes the buffer out as a new
+    # segment; compact() merges every segment into one.
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segments = [ResultArchive(path) for path in sorted(self.directory.glob(SEGMENT_PATTERN))]
+        self._pending: list[ResultColumns] = []
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self._segments) + sum(len(columns.records) for columns in self._pending)
+
+    def add(self, dimensions: RoomDimensions, result: CeilingCalculation, quoted_on: date = None) -> None:
+        self.add_many([dimensions], [result], quoted_on)
+
+    def add_many(
+        self,
+        rooms: list[RoomDimensions],
+        results: Union[list[CeilingCalculation], BatchCalculation],
+        quoted_on: date = None
+    ) -> None:
+        # results may be a BatchCalculation for the same rooms; rooms it
+        # could not calculate are not stored
+        if isinstance(results, BatchCalculation):
+            columns = columns_from_batch(results)
+            rooms = [room for room, ok in zip(rooms, results.valid.tolist()) if ok]
+        else:
+            columns = columns_from_results(results)
+        if len(rooms) != len(columns.records):
+            raise ValueError("give one result per room")
+        self._pending.append(_quote_records(columns, _room_ticks(rooms), quoted_on or date.today()))
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        number = max((int(segment.path.stem.split('-')[1]) for segment in self._segments), default=0) + 1
+        path = self.directory / SEGMENT_PATTERN.replace('*', f"{number:06d}")
+        write_archive(path, _sorted(self._pending))
+        self._segments.append(ResultArchive(path))
+        self._pending = []
+
+    def compact(self) -> None:
+        self.flush()
+        if len(self._segments) < 2:
+            return
+        merged = _sorted([segment.columns() for segment in self._segments])
+        old = [segment.path for segment in self._segments]
+        path = self.directory / SEGMENT_PATTERN.replace('*', f"{int(old[-1].stem.split('-')[1]) + 1:06d}")
+        write_archive(path, merged)
+        for segment in self._segments:
+            segment.close()
+        self._segments = [ResultArchive(path)]
+        for stale in old:
+            stale.unlink()
+
+    def close(self) -> None:
+        # unmaps every segment; the store cannot be read afterwards
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def find(self, dimensions: RoomDimensions, since: date = None, until: date = None) -> list[Quote]:
+        # every quote for exactly these dimensions, oldest first
+        ticks = _room_ticks([dimensions])
+        key = dimension_keys(ticks)[0]
+        quotes = []
+        for segment in self._segments:
+            keys = segment.records['key']
+            candidates = np.arange(np.searchsorted(keys, key, side='left'), np.searchsorted(keys, key, side='right'))
+            quotes.extend(self._matching(segment, candidates, ticks[0]))
+        for columns in self._pending:
+            quotes.extend(self._matching(columns, np.flatnonzero(columns.records['key'] == key), ticks[0]))
+        return sorted(
+            (quote for quote in quotes if (since is None or quote.quoted_on >= since) and (until is None or quote.quoted_on <= until)),
+            key=lambda quote: quote.quoted_on
+        )
+
+    def latest(self, dimensions: RoomDimensions) -> Optional[Quote]:
+        quotes = self.find(dimensions)
+        return quotes[-1] if quotes else None
+
+    def quoted_between(self, since: date, until: date) -> list[Quote]:
+        first, last = np.datetime64(since, 'D'), np.datetime64(until, 'D')
+        quotes = []
+        for source in self._segments + self._pending:
+            dates = source.records['quoted_on']
+            quotes.extend(self._quotes(source, np.flatnonzero((dates >= first) & (dates <= last))))
+        return sorted(quotes, key=lambda quote: quote.quoted_on)
+
+    def _matching(self, source, candidates: np.ndarray, ticks: np.ndarray) -> list[Quote]:
+        # a shared key is almost always the same room, but check the ticks
+        records = source.records[candidates]
+        same = np.all([records[name] == ticks[index] for index, name in enumerate(DIMENSION_FIELDS)], axis=0)
+        return self._quotes(source, candidates[same])
+
+    @staticmethod
+    def _quotes(source, indices: np.ndarray) -> list[Quote]:
+        if not len(indices):
+            return []
+        # only the rods of the chosen records are read from the mapped file
+        records = np.asarray(source.records[indices])
+        first = int(records['main_offset'].min())
+        last = int((records['main_offset'] + records['main_count'] + records['cross_count']).max())
+        records['main_offset'] -= first
+        records['cross_offset'] -= first
+        results = decode_results(records, source.lengths[first:last])
+
+        # int / int is correctly rounded, so this is exactly ticks_to_feet()
+        rooms = zip(*(records[name].tolist() for name in DIMENSION_FIELDS))
+        return [
+            Quote(quoted_on=quoted_on, dimensions=RoomDimensions(*(value / TICKS_PER_FOOT for value in room)), result=result)
+            for quoted_on, room, result in zip(records['quoted_on'].tolist(), rooms, results)
+        ]
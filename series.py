@@ -0,0 +1,366 @@
+from collections.abc import Sequence
+from dataclasses import dataclass, fields, replace
+from fractions import Fraction
+from functools import lru_cache
+from math import ceil, floor, lcm
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
+from fixed import FixedDimensions, calculate_fixed_requirements, catalog_ticks, fixed_dimensions
+from units import TICKS_PER_FOOT, to_ticks
+from utils import (
+    CeilingCalculation,
+    RoomDimensions,
+    calculate_board_requirements,
+    calculate_parameters,
+    calculate_room_area,
+)
+
+# Every size is the exact decimal the user typed, as a Fraction of whole
+# ticks (see units.py), so the counts agree with fixed.py: a rod that is
+# 12.0 ft in decimal is never 12.000000000000002 ft here.
+
+# Up to this wall length fixed's loops over the rods cost less than the
+# Fraction arithmetic here, so such rooms take their counts from fixed and
+# only the rod lengths are put into runs
+FIXED_UP_TO_FEET = 600
+
+def exact_feet(value) -> Fraction:
+    return value if isinstance(value, Fraction) else Fraction(to_ticks(value), TICKS_PER_FOOT)
+
+@lru_cache(maxsize=256)
+def exact_catalog(catalog: MaterialCatalog) -> MaterialCatalog:
+    ticks = catalog_ticks(catalog)
+    return replace(catalog, **{item.name: Fraction(getattr(ticks, item.name), TICKS_PER_FOOT) for item in fields(catalog)})
+
+@dataclass(frozen=True)
+class LengthRun:
+    first: Fraction
+    step: Fraction
+    count: int
+
+    def __getitem__(self, index: int) -> float:
+        return float(self.first + self.step * index)
+
+    @property
+    def exact_last(self) -> Fraction:
+        return self.first + self.step * (self.count - 1) if self.count else Fraction(0)
+
+    @property
+    def last(self) -> float:
+        return float(self.exact_last)
+
+    @property
+    def exact_total(self) -> Fraction:
+        return self.count * self.first + self.step * Fraction(self.count * (self.count - 1), 2)
+
+    @property
+    def total(self) -> float:
+        return float(self.exact_total)
+
+    def exact(self, *values: Fraction) -> tuple[int, ...]:
+        # first + step * k == (first_num + step_num * k) / denominator; any
+        # values passed come back over the same denominator
+        denominator = lcm(self.first.denominator, self.step.denominator, *(Fraction(value).denominator for value in values))
+        return (int(self.first * denominator), int(self.step * denominator), denominator,
+                *(int(value * denominator) for value in values))
+
+class LengthSeries(Sequence):
+    def __init__(self, runs: list[LengthRun]):
+        self.runs = tuple(run for run in runs if run.count > 0)
+        self._count = sum(run.count for run in self.runs)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('length series index out of range')
+        for run in self.runs:
+            if index < run.count:
+                return run[index]
+            index -= run.count
+
+    def __repr__(self) -> str:
+        return f"LengthSeries({list(self.runs)!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LengthSeries):
+            return self.runs == other.runs
+        return NotImplemented
+
+    @property
+    def exact_last(self) -> Fraction:
+        return self.runs[-1].exact_last if self.runs else Fraction(0)
+
+    @property
+    def last(self) -> float:
+        return float(self.exact_last)
+
+    @property
+    def exact_total(self) -> Fraction:
+        return sum((run.exact_total for run in self.runs), Fraction(0))
+
+    @property
+    def total(self) -> float:
+        return float(self.exact_total)
+
+def floor_sum(n: int, m: int, a: int, b: int) -> int:
+    # sum of floor((a * i + b) / m) for i in range(n), in O(log m)
+    total = 0
+    if a < 0 or a >= m:
+        quotient, a = divmod(a, m)
+        total += quotient * (n * (n - 1) // 2)
+    if b < 0 or b >= m:
+        quotient, b = divmod(b, m)
+        total += quotient * n
+
+    while True:
+        if a >= m:
+            total += (n * (n - 1) // 2) * (a // m)
+            a %= m
+        if b >= m:
+            total += n * (b // m)
+            b %= m
+        y_max = a * n + b
+        if y_max < m:
+            break
+        n, b = divmod(y_max, m)
+        m, a = a, m
+
+    return total
+
+def count_positions(start: Fraction, spacing: Fraction, limit: Fraction, inclusive: bool = False) -> int:
+    # number of start + spacing * k (k >= 0) that are < limit, or <= limit when inclusive
+    reach = (Fraction(limit) - Fraction(start)) / Fraction(spacing)
+    if inclusive:
+        return floor(reach) + 1 if reach >= 0 else 0
+    return ceil(reach) if reach > 0 else 0
+
+def _index_range_above(run: LengthRun, threshold: Fraction, strict: bool) -> tuple[int, int]:
+    # half-open range of k whose length is > threshold (>= when not strict)
+    first, step, _, threshold = run.exact(threshold)
+    bound = threshold - first
+    if step == 0:
+        inside = 0 > bound if strict else 0 >= bound
+        low, high = (0, run.count) if inside else (0, 0)
+    elif step > 0:
+        low = bound // step + 1 if strict else -(-bound // step)
+        high = run.count
+    else:
+        low = 0
+        high = -(bound // -step) if strict else -bound // -step + 1
+    return min(max(low, 0), run.count), min(max(high, 0), run.count)
+
+def _sum_ceil_over(run: LengthRun, low: int, high: int, offset: Fraction, divisor: Fraction) -> int:
+    # sum of ceil((length_k - offset) / divisor) for k in [low, high)
+    first, step, _, offset, divisor = run.exact(offset, divisor)
+    count = high - low
+    if count <= 0:
+        return 0
+    shifted = first + step * low - offset
+    return -floor_sum(count, divisor, -step, -shifted)
+
+def _sum_floor_over(run: LengthRun, low: int, high: int, offset: Fraction, divisor: Fraction) -> int:
+    # sum of floor((length_k - offset) / divisor) for k in [low, high)
+    first, step, _, offset, divisor = run.exact(offset, divisor)
+    count = high - low
+    if count <= 0:
+        return 0
+    shifted = first + step * low - offset
+    return floor_sum(count, divisor, step, shifted)
+
+def calculate_main_rods(length1: float, length2: float, width1: float, width2: float, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, LengthSeries, float, str]:
+    catalog = exact_catalog(catalog)
+    FIRST_DISTANCE = catalog.first_rod_distance
+    SPACING = catalog.main_spacing
+    STANDARD_LENGTH = catalog.rod_length
+    WALL_THRESHOLD = catalog.main_wall_threshold
+    OVERLAP = catalog.main_overlap
+
+    length1, length2, width1 = exact_feet(length1), exact_feet(length2), exact_feet(width1)
+    spaced = count_positions(FIRST_DISTANCE, SPACING, width1)
+    if spaced == 0:
+        raise ValueError("width1 must be more than the first rod distance")
+
+    last_spaced = FIRST_DISTANCE + SPACING * (spaced - 1)
+    start, slope = length1, (length2 - length1) / width1
+    runs = [LengthRun(start + slope * FIRST_DISTANCE, slope * SPACING, spaced)]
+    if width1 - last_spaced >= WALL_THRESHOLD:
+        wall_position = min(width1, last_spaced + SPACING)
+        runs.append(LengthRun(start + slope * wall_position, Fraction(0), 1))
+
+    main_lengths = LengthSeries(runs)
+
+    total_extra_needed = Fraction(0)
+    extra_rods_needed = 0
+    for run in main_lengths.runs:
+        low, high = _index_range_above(run, STANDARD_LENGTH, strict=True)
+        if high <= low:
+            continue
+        over = LengthRun(run.first + run.step * low, run.step, high - low)
+        additional_rods = _sum_ceil_over(run, low, high, STANDARD_LENGTH, STANDARD_LENGTH)
+        total_extra_needed += over.exact_total - STANDARD_LENGTH * over.count + additional_rods * OVERLAP
+        extra_rods_needed += additional_rods
+
+    main_count = len(main_lengths) + extra_rods_needed
+    extra_needed_str = f"{float(round(total_extra_needed, 2)):.2f} FT" if total_extra_needed > 0 else ""
+
+    return main_count, main_lengths, main_lengths.last, extra_needed_str
+
+def calculate_cross_rods(length1: float, length2: float, width1: float, width2: float, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, LengthSeries, float]:
+    catalog = exact_catalog(catalog)
+    FIRST_DISTANCE = catalog.first_rod_distance
+    SPACING = catalog.cross_spacing
+    MIN_THRESHOLD = catalog.cross_min_threshold
+    MAX_THRESHOLD = catalog.cross_max_threshold
+    STANDARD_LENGTH = catalog.rod_length
+
+    width1, width2 = exact_feet(width1), exact_feet(width2)
+    longer_wall = max(exact_feet(length1), exact_feet(length2))
+
+    count = count_positions(FIRST_DISTANCE, SPACING, longer_wall, inclusive=True)
+    if count and (longer_wall - (FIRST_DISTANCE + SPACING * (count - 1))) <= MIN_THRESHOLD:
+        count -= 1
+    if count and (longer_wall - (FIRST_DISTANCE + SPACING * (count - 1))) > MAX_THRESHOLD:
+        count += 1
+
+    if count:
+        start, slope = width1, (width2 - width1) / longer_wall
+        cross_lengths = LengthSeries([LengthRun(start + slope * FIRST_DISTANCE, slope * SPACING, count)])
+    else:
+        cross_lengths = LengthSeries([])
+
+    num_cross_rods = ceil(cross_lengths.exact_total / STANDARD_LENGTH)
+
+    return num_cross_rods, cross_lengths, cross_lengths.last
+
+def count_l_patti_cuts(main_lengths: LengthSeries, catalog: MaterialCatalog = DEFAULT_CATALOG) -> int:
+    catalog = exact_catalog(catalog)
+    FIRST_L_PATTI = catalog.first_l_patti
+    SPACING = catalog.l_patti_spacing
+    END_CLEARANCE = catalog.l_patti_end_clearance
+
+    # a main of length L takes floor((L - clearance - first) / spacing) + 1
+    # pieces once L - clearance >= first
+    reach = FIRST_L_PATTI + END_CLEARANCE
+    total = 0
+    for run in main_lengths.runs:
+        low, high = _index_range_above(run, reach, strict=False)
+        total += _sum_floor_over(run, low, high, reach, SPACING) + (high - low)
+    return total
+
+def calculate_l_patti(length: float, linter_spacing: float, main_lengths: LengthSeries, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, int, int, float]:
+    L_PATTI_LENGTH = exact_catalog(catalog).l_patti_length
+
+    total_l_patti_cuts = count_l_patti_cuts(main_lengths, catalog)
+
+    linter_spacing = exact_feet(linter_spacing)
+    pieces_per_l_patti = int(L_PATTI_LENGTH / linter_spacing)
+    full_l_patti_needed = ceil(total_l_patti_cuts / pieces_per_l_patti)
+
+    total_pieces_available = full_l_patti_needed * pieces_per_l_patti
+    remaining_pieces = total_pieces_available - total_l_patti_cuts
+
+    return (full_l_patti_needed, total_l_patti_cuts, remaining_pieces, float(linter_spacing))
+
+def _length_runs(dimensions: FixedDimensions, catalog: MaterialCatalog, main_rods: int, cross_rods: int) -> tuple[LengthSeries, LengthSeries]:
+    # the runs calculate_main_rods and calculate_cross_rods build, from the
+    # number of rods fixed laid out along each wall
+    ticks = catalog_ticks(catalog)
+    FIRST_DISTANCE = ticks.first_rod_distance
+    length1, length2, width1, width2 = dimensions.length1, dimensions.length2, dimensions.width1, dimensions.width2
+
+    spaced = -((FIRST_DISTANCE - width1) // ticks.main_spacing)
+    scale = width1 * TICKS_PER_FOOT
+    main_runs = [LengthRun(
+        Fraction(length1 * width1 + (length2 - length1) * FIRST_DISTANCE, scale),
+        Fraction((length2 - length1) * ticks.main_spacing, scale),
+        spaced
+    )]
+    if main_rods > spaced:
+        wall_position = min(width1, FIRST_DISTANCE + ticks.main_spacing * spaced)
+        main_runs.append(LengthRun(Fraction(length1 * width1 + (length2 - length1) * wall_position, scale), Fraction(0), 1))
+
+    if not cross_rods:
+        return LengthSeries(main_runs), LengthSeries([])
+    longer_wall = max(length1, length2)
+    scale = longer_wall * TICKS_PER_FOOT
+    cross_run = LengthRun(
+        Fraction(width1 * longer_wall + (width2 - width1) * FIRST_DISTANCE, scale),
+        Fraction((width2 - width1) * ticks.cross_spacing, scale),
+        cross_rods
+    )
+    return LengthSeries(main_runs), LengthSeries([cross_run])
+
+def calculate_ceiling_summary(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    values = (dimensions.length1, dimensions.length2, dimensions.width1, dimensions.width2, dimensions.linter_spacing)
+    if not any(isinstance(value, Fraction) for value in values) and max(abs(value) for value in values[:4]) <= FIXED_UP_TO_FEET:
+        ticks = fixed_dimensions(dimensions)
+        result = calculate_fixed_requirements(ticks, catalog)
+        result.main_lengths, result.cross_lengths = _length_runs(ticks, catalog, len(result.main_lengths), len(result.cross_lengths))
+        return result
+    return calculate_closed_form_summary(dimensions, catalog)
+
+def calculate_closed_form_summary(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    # the same time for any size of room
+    exact = RoomDimensions(*(exact_feet(getattr(dimensions, item.name)) for item in fields(dimensions)))
+    # utils' wall-only stages are exact when given fractions
+    params_full, params_extra = calculate_parameters(exact, exact_catalog(catalog))
+
+    main_rods_count, main_lengths, last_main_length, extra_main_needed = calculate_main_rods(
+        exact.length1,
+        exact.length2,
+        exact.width1,
+        exact.width2,
+        catalog
+    )
+    cross_rods_count, cross_lengths, last_cross_length = calculate_cross_rods(
+        exact.length1,
+        exact.length2,
+        exact.width1,
+        exact.width2,
+        catalog
+    )
+
+    total_parameter_length = exact.length1 + exact.length2 + exact.width1 + exact.width2
+
+    full_l_patti, l_patti_cuts, remaining_cuts, cut_size = calculate_l_patti(
+        max(exact.width1, exact.width2),
+        exact.linter_spacing,
+        main_lengths,
+        catalog
+    )
+
+    board_count, board_extra_sqft = calculate_board_requirements(exact, exact_catalog(catalog))
+    room_area = calculate_room_area(exact)
+
+    return CeilingCalculation(
+        parameters_full=params_full,
+        parameters_extra=float(round(params_extra, 2)),
+        main_rods=main_rods_count,
+        cross_rods=cross_rods_count,
+        connecting_clips=main_rods_count * cross_rods_count,
+        screws=ceil(total_parameter_length) * 12,
+        total_parameter_length=float(round(total_parameter_length, 2)),
+        main_rods_length=float(round(main_lengths.exact_total, 2)),
+        cross_rods_length=float(round(cross_lengths.exact_total, 2)),
+        l_patti_count=l_patti_cuts,
+        black_screws=ceil(room_area / 1000),
+        fasteners=l_patti_cuts,
+        fastener_clips=l_patti_cuts,
+        board_count=board_count,
+        board_extra_sqft=float(board_extra_sqft),
+        full_l_patti_count=full_l_patti,
+        l_patti_cuts=l_patti_cuts,
+        l_patti_remaining=remaining_cuts,
+        l_patti_cut_size=cut_size,
+        last_cross_length=float(round(cross_lengths.exact_last, 2)),
+        cross_lengths=cross_lengths,
+        main_lengths=main_lengths,
+        last_main_length=float(round(main_lengths.exact_last, 2)),
+        extra_main_needed=extra_main_needed
+    )
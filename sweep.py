@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import Iterable, Union
+
+import numpy as np
+
+from batch import calculate_ceiling_requirements_batch
+from boards import layout_sheet_count
+from catalog import CATALOG_FIELDS, DEFAULT_CATALOG, MaterialCatalog
+from pricing import MATERIALS, PriceTable, price_quantities
+from project import BOM_FIELDS
+from utils import RoomDimensions
+
+# pieces of stock bought: rods, L-patti and the sheets of each room's board layout
+STOCK_FIELDS = ('parameters_full', 'main_rods', 'cross_rods', 'full_l_patti_count', 'boards')
+RANKINGS = ('stock', 'cost') + BOM_FIELDS + ('boards',)
+
+@dataclass
+class SweepResult:
+    catalog: MaterialCatalog
+    totals: dict[str, float]
+    score: float
+    # False when some room cannot be laid out with this catalog
+    feasible: bool
+
+def catalog_grid(grid: dict[str, Iterable[float]], base: MaterialCatalog = DEFAULT_CATALOG) -> list[MaterialCatalog]:
+    # e.g. catalog_grid({'main_spacing': (3, 3.5, 4), 'rod_length': (10, 12)})
+    unknown = set(grid) - set(CATALOG_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown catalog fields: {', '.join(sorted(unknown))}")
+
+    # building from a dict is much cheaper than dataclasses.replace() per combination
+    names = list(grid)
+    fixed = {name: getattr(base, name) for name in CATALOG_FIELDS if name not in grid}
+    return [MaterialCatalog(**fixed, **dict(zip(names, values))) for values in product(*([float(value) for value in grid[name]] for name in names))]
+
+def _board_sheets(rooms: list[RoomDimensions], catalogs: list[MaterialCatalog], valid: np.ndarray) -> np.ndarray:
+    # a layout only depends on the sheet size, so each size is laid out once
+    # per room; rooms a catalog cannot lay out add no sheets
+    laid_out = valid.any(axis=0).tolist()
+    per_size = {}
+    for catalog in catalogs:
+        size = (catalog.board_length, catalog.board_width)
+        if size not in per_size:
+            per_size[size] = np.array([layout_sheet_count(room, catalog) if ok else 0 for room, ok in zip(rooms, laid_out)], dtype=np.int64)
+    sheets = np.stack([per_size[catalog.board_length, catalog.board_width] for catalog in catalogs])
+    return np.where(valid, sheets, 0).sum(axis=1)
+
+def _totals(results, configs: int, rooms: int, board_sheets: np.ndarray) -> dict[str, np.ndarray]:
+    # rows run room by room inside each configuration
+    totals = {name: getattr(results, name).reshape(configs, rooms).sum(axis=1) for name in BOM_FIELDS}
+    totals['boards'] = board_sheets
+    totals['stock'] = sum(totals[name] for name in STOCK_FIELDS)
+    return totals
+
+def sweep(
+    rooms: Union[RoomDimensions, list[RoomDimensions]],
+    catalogs: Union[dict[str, Iterable[float]], list[MaterialCatalog]],
+    rank_by: str = 'stock',
+    prices: Union[dict[str, float], PriceTable] = None,
+    base: MaterialCatalog = DEFAULT_CATALOG
+) -> list[SweepResult]:
+    # Lays every room out under every catalog in one batch call and ranks the
+    # catalogs by total stock, by one material, or by cost at unit prices per
+    # material (e.g. {'main_rods': 310, 'boards': 1450}) or from a supplier
+    # PriceTable. Cheapest first; catalogs that cannot lay out every room go last.
+    if rank_by not in RANKINGS:
+        raise ValueError(f"rank_by must be one of: {', '.join(RANKINGS)}")
+    if rank_by == 'cost' and not prices:
+        raise ValueError("ranking by cost needs prices")
+    if isinstance(prices, dict) and set(prices) - set(RANKINGS[2:]):
+        raise ValueError(f"Unknown materials in prices: {', '.join(sorted(set(prices) - set(RANKINGS[2:])))}")
+
+    rooms = [rooms] if isinstance(rooms, RoomDimensions) else list(rooms)
+    catalogs = catalog_grid(catalogs, base) if isinstance(catalogs, dict) else list(catalogs)
+    if not rooms or not catalogs:
+        return []
+
+    columns = np.array([[room.length1, room.length2, room.width1, room.width2, room.linter_spacing] for room in rooms], dtype=np.float64)
+    results = calculate_ceiling_requirements_batch(
+        *np.tile(columns, (len(catalogs), 1)).T,
+        [catalog for catalog in catalogs for _ in rooms]
+    )
+
+    valid = results.valid.reshape(len(catalogs), len(rooms))
+    totals = _totals(results, len(catalogs), len(rooms), _board_sheets(rooms, catalogs, valid))
+    if isinstance(prices, PriceTable):
+        costs = price_quantities({name: totals[name] for name in MATERIALS}, prices)
+        totals['cost'] = costs.total
+        # materials the table has no price for, which the cost leaves out
+        totals['unpriced'] = costs.unpriced.sum(axis=1)
+    elif prices:
+        totals['cost'] = sum(totals[name] * price for name, price in prices.items())
+
+    feasible = valid.all(axis=1)
+    score = totals[rank_by].astype(np.float64)
+    order = np.lexsort((score, ~feasible))
+
+    names = list(totals)
+    rows = zip(*(totals[name][order].tolist() for name in names))
+    return [
+        SweepResult(catalog=catalogs[index], totals=dict(zip(names, row)), score=row_score, feasible=row_feasible)
+        for index, row, row_score, row_feasible in zip(order.tolist(), rows, score[order].tolist(), feasible[order].tolist())
+    ]
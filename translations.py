@@ -1,7 +1,75 @@
+ENGLISH_TRANSLATIONS = {
+    'switch_language': 'Convert to Hinglish',
+    'select_unit': 'Select measurement unit:',
+    'linter_spacing': 'Linter Spacing',
+    'linter_spacing_help': 'Distance from Roof/Linter to the Main/Enter',
+    'room_measurements': 'Room Measurements',
+    'calculation_results': 'Calculation Results',
+    'wall1_length': 'Wall 1 Length',
+    'wall1_width': 'Wall 1 Width',
+    'wall2_length': 'Wall 2 Length',
+    'wall2_width': 'Wall 2 Width',
+    'calculate': 'Calculate',
+    'parameters': 'Parameters (1 inch × 1 inch Steel Rods)',
+    'main_rods': 'Main/Enter Rods (1 inch × 2 inch)',
+    'cross_rods': 'Cross Rods (3 inch × 1 inch)',
+    'support_materials': 'Support Materials',
+    'screws': 'Screws',
+    'plywood': 'Plywood Boards (6ft × 4ft x 0.5inch)',
+    'total_length': 'Total Perimeter Length',
+    'full_parameters': 'Full Parameters (12ft each)',
+    'extra_length': 'Extra Parameter Length',
+    'overlap': 'with 4 inch overlap',
+    'rod_count': 'Number of Main Rods',
+    'extra_needed': 'Need Main Rod for Extra',
+    'total_needed': 'Total Main Rod Needed',
+    'rod_details': 'Main Rod Details',
+    'first_rod': 'First rod: 2ft from wall',
+    'spacing': 'Spacing between rods',
+    'last_length': 'Last Main Length',
+    'extra_main_needed': 'Extra Main Needed',
+    'cross_count': 'Number of Cross Rods',
+    'cross_details': 'Cross Rod Details',
+    'cross_spacing': 'Spacing: 2ft between rods',
+    'last_cross_length': 'Last Cross Length',
+    'rod_table': 'Rod Lengths',
+    'rod': 'Rod',
+    'rod_number': 'No.',
+    'length_ft': 'Length (ft)',
+    'main': 'Main',
+    'cross': 'Cross',
+    'l_patti_count': 'Full L-Patti Count (8ft)',
+    'cutting_l_patti': 'Cutting L-Patti',
+    'cut_size': 'Cut Size',
+    'piece': 'piece',
+    'remaining_l_patti': 'Remaining Cutted L-Patti',
+    'fasteners': 'Fasteners needed',
+    'per_l_patti': '1 per L-patti',
+    'fastener_clips': 'Fastener clips needed',
+    'per_fastener': '1 per fastener',
+    'nut_bolt': 'Nut Bolt Pair needed',
+    'per_fastener_clip': '1 per Fastener Clip',
+    'connecting_clips': 'Connecting clips needed',
+    'at_intersections': 'at Main-Cross intersections',
+    'regular_screws': 'Regular screws',
+    'screw_spacing': '1ft spacing on parameters',
+    'black_screws': 'Black screws',
+    'box': 'Box(es)',
+    'per_1000_sqft': '1 Box per 1000 sqft',
+    'full_boards': 'Full boards needed',
+    'extra_area': 'Extra area needed',
+    'boards': 'boards',
+    'board_layout': 'Sheets by cut layout',
+    'layout_waste': 'trimmed off',
+    'download_excel': 'Download Excel'
+}
+
 HINGLISH_TRANSLATIONS = {
     'calculator_title': 'Hinglish Version',
+    'switch_language': 'Convert to English',
     'select_unit': 'Measurement unit chuno:',
     'linter_spacing': 'Linter Spacing (Chad se Main Rod ki Height)',
+    'linter_spacing_help': 'Chad/Linter se Main/Enter tak ki doori',
     'room_measurements': 'Room Measurements (Kamre ki Maap)',
     'calculation_results': 'Calculation Results (Ganit ke Parinaam)',
     'wall1_length': 'Deewar 1 Lambai',
@@ -18,6 +86,7 @@ HINGLISH_TRANSLATIONS = {
     'total_length': 'Kul Parameter Lambai',
     'full_parameters': 'Poore Parameters',
     'extra_length': 'Extra Parameter Lambai',
+    'overlap': '4 inch overlap ke saath',
     'rod_count': 'Main Rod ki Sankhya',
     'extra_needed': 'Extra Main Rod ki Jarurat',
     'total_needed': 'Kul Main Rod ki Jarurat',
@@ -25,18 +94,39 @@ HINGLISH_TRANSLATIONS = {
     'first_rod': 'Pehla rod: deewar se 2ft',
     'spacing': 'Rod ke beech ki doori',
     'last_length': 'Antim Main Lambai',
+    'extra_main_needed': 'Extra Main ki Jarurat',
     'cross_count': 'Cross Rod ki Sankhya',
     'cross_details': 'Cross Rod ka Vivaran',
     'cross_spacing': 'Doori: rod ke beech 2ft',
+    'last_cross_length': 'Antim Cross Lambai',
+    'rod_table': 'Rod ki Lambai',
+    'rod': 'Rod',
+    'rod_number': 'Kram',
+    'length_ft': 'Lambai (ft)',
+    'main': 'Main',
+    'cross': 'Cross',
     'l_patti_count': 'Poori L-Patti ki Sankhya',
     'cutting_l_patti': 'Katne Wali L-Patti',
+    'cut_size': 'Kaat ka Size',
+    'piece': 'tukda',
     'remaining_l_patti': 'Bachi hui Kati L-Patti',
     'fasteners': 'Fastener ki Jarurat',
+    'per_l_patti': 'har L-Patti par 1',
     'fastener_clips': 'Fastener Clip ki Jarurat',
+    'per_fastener': 'har Fastener par 1',
     'nut_bolt': 'Nut Bolt Jodi ki Jarurat',
+    'per_fastener_clip': 'har Fastener Clip par 1',
     'connecting_clips': 'Connecting Clip ki Jarurat',
+    'at_intersections': 'Main-Cross jod par',
     'regular_screws': 'Sadhaaran Pech',
+    'screw_spacing': 'parameters par 1ft doori',
     'black_screws': 'Kale Pech',
+    'box': 'Dibba',
+    'per_1000_sqft': 'har 1000 sqft par 1 Dibba',
     'full_boards': 'Poore Board ki Jarurat',
-    'extra_area': 'Extra Area ki Jarurat'
+    'extra_area': 'Extra Area ki Jarurat',
+    'boards': 'board',
+    'board_layout': 'Cut layout se Sheet',
+    'layout_waste': 'katkar bekaar',
+    'download_excel': 'Excel Download karo'
 }
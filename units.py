@@ -0,0 +1,40 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+from fractions import Fraction
+
+UNITS = ['ft', 'mm', 'cm', 'inches', 'm', 'yd']
+
+# exact, by definition of the inch (25.4 mm)
+FEET_PER_UNIT = {
+    'ft': Fraction(1),
+    'mm': Fraction(5, 1524),
+    'cm': Fraction(25, 762),
+    'inches': Fraction(1, 12),
+    'm': Fraction(5000, 1524),
+    'yd': Fraction(3)
+}
+
+# one tick is a nanometre: feet typed to five decimals, millimetres to six and
+# inches down to 1/64 are all whole numbers of ticks, so typed sizes stay exact
+TICKS_PER_FOOT = 304800000
+TICKS_PER_UNIT = {unit: int(factor * TICKS_PER_FOOT) for unit, factor in FEET_PER_UNIT.items()}
+
+def convert_to_feet(value, unit):
+    # the nearest float to the exact value, so 12 inches is exactly 1.0 ft
+    return float(Fraction(value) * FEET_PER_UNIT[unit])
+
+def to_ticks(value, unit='ft'):
+    # shortest repr is the number as typed: 0.1 ft is 1/10 ft, not the binary
+    # double just above it; anything finer than a tick rounds half to even
+    value = float(value)
+    scaled = value * TICKS_PER_UNIT[unit]
+    if abs(scaled) < 2 ** 50:
+        # the float product is within a quarter tick of the typed decimal's,
+        # so when it is that close to a whole tick, that tick is the answer
+        nearest = round(scaled)
+        if abs(scaled - nearest) < 0.25:
+            return nearest
+    ticks = Decimal(repr(value)) * TICKS_PER_UNIT[unit]
+    return int(ticks.to_integral_value(ROUND_HALF_EVEN))
+
+def ticks_to_feet(ticks):
+    return float(Fraction(ticks, TICKS_PER_FOOT))
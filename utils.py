@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from math import ceil
-from decimal import Decimal, ROUND_HALF_UP
+
+from catalog import DEFAULT_CATALOG, MaterialCatalog
 
 @dataclass
 class RoomDimensions:
@@ -46,9 +47,9 @@ def calculate_rod_length_with_overlap(length: float, standard_length: float = 12
     
     return full_rods, total_length
 
-def calculate_parameters(dimensions: RoomDimensions) -> tuple[int, float]:
-    STANDARD_LENGTH = 12
-    OVERLAP = 4/12
+def calculate_parameters(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, float]:
+    STANDARD_LENGTH = catalog.parameter_length
+    OVERLAP = catalog.parameter_overlap
     
     total_perimeter = dimensions.length1 + dimensions.length2 + dimensions.width1 + dimensions.width2
     
@@ -62,13 +63,12 @@ def calculate_parameters(dimensions: RoomDimensions) -> tuple[int, float]:
     
     return full_rods, round(extra_length, 2)
 
-def calculate_main_rods(length1: float, length2: float, width1: float, width2: float) -> tuple[int, list[float], float, str]:
-    FIRST_DISTANCE = 2
-    SPACING = 4
-    STANDARD_LENGTH = 12
-    WALL_THRESHOLD = 3.5
-    OVERLAP_INCHES = 5
-    OVERLAP = OVERLAP_INCHES / 12
+def calculate_main_rods(length1: float, length2: float, width1: float, width2: float, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, list[float], float, str]:
+    FIRST_DISTANCE = catalog.first_rod_distance
+    SPACING = catalog.main_spacing
+    STANDARD_LENGTH = catalog.rod_length
+    WALL_THRESHOLD = catalog.main_wall_threshold
+    OVERLAP = catalog.main_overlap
     
     positions = []
     current_pos = FIRST_DISTANCE
@@ -103,13 +103,12 @@ def calculate_main_rods(length1: float, length2: float, width1: float, width2: f
     
     return main_count, main_lengths, main_lengths[-1] if main_lengths else 0, extra_needed_str
 
-def calculate_cross_rods(length1: float, length2: float, width1: float, width2: float) -> tuple[int, list[float], float]:
-    FIRST_DISTANCE = 2
-    SPACING = 2
-    MIN_THRESHOLD = 2
-    MAX_THRESHOLD = 2.5
-    OVERLAP = 4/12
-    STANDARD_LENGTH = 12
+def calculate_cross_rods(length1: float, length2: float, width1: float, width2: float, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, list[float], float]:
+    FIRST_DISTANCE = catalog.first_rod_distance
+    SPACING = catalog.cross_spacing
+    MIN_THRESHOLD = catalog.cross_min_threshold
+    MAX_THRESHOLD = catalog.cross_max_threshold
+    STANDARD_LENGTH = catalog.rod_length
     
     longer_wall = max(length1, length2)
     shorter_wall = min(length1, length2)
@@ -139,15 +138,16 @@ def calculate_cross_rods(length1: float, length2: float, width1: float, width2:
     
     return num_cross_rods, cross_lengths, last_cross_length
 
-def calculate_l_patti(length: float, linter_spacing: float, main_lengths: list[float]) -> tuple[int, int, int, float]:
-    L_PATTI_LENGTH = 8
-    FIRST_L_PATTI = 3
-    SPACING = 4
+def calculate_l_patti(length: float, linter_spacing: float, main_lengths: list[float], catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[int, int, int, float]:
+    L_PATTI_LENGTH = catalog.l_patti_length
+    FIRST_L_PATTI = catalog.first_l_patti
+    SPACING = catalog.l_patti_spacing
+    END_CLEARANCE = catalog.l_patti_end_clearance
     
     def count_l_pattis_for_main(main_length: float) -> int:
         current_pos = FIRST_L_PATTI
         count = 0
-        while current_pos <= (main_length - 1):
+        while current_pos <= (main_length - END_CLEARANCE):
             count += 1
             current_pos += SPACING
         return count
@@ -165,9 +165,9 @@ def calculate_l_patti(length: float, linter_spacing: float, main_lengths: list[f
     
     return (full_l_patti_needed, total_l_patti_cuts, remaining_pieces, linter_spacing)
 
-def calculate_board_requirements(dimensions: RoomDimensions) -> tuple[float, float]:
-    BOARD_LENGTH = 6
-    BOARD_WIDTH = 4
+def calculate_board_requirements(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> tuple[float, float]:
+    BOARD_LENGTH = catalog.board_length
+    BOARD_WIDTH = catalog.board_width
     BOARD_AREA = BOARD_LENGTH * BOARD_WIDTH
     
     room_area = ((dimensions.length1 + dimensions.length2) / 2) * ((dimensions.width1 + dimensions.width2) / 2)
@@ -182,21 +182,63 @@ def calculate_room_area(dimensions: RoomDimensions) -> float:
     avg_width = (dimensions.width1 + dimensions.width2) / 2
     return avg_length * avg_width
 
-def calculate_ceiling_requirements(dimensions: RoomDimensions) -> CeilingCalculation:
-    params_full, params_extra = calculate_parameters(dimensions)
+def calculate_ceiling_requirements(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    # feet in and out, counted in whole ticks (see fixed.py), which builds on
+    # this module and so is imported here
+    from fixed import calculate_ceiling_requirements as calculate_fixed
+    return calculate_fixed(dimensions, catalog)
+
+def calculate_float_requirements(dimensions: RoomDimensions, catalog: MaterialCatalog = DEFAULT_CATALOG) -> CeilingCalculation:
+    # the original float feet pipeline, kept as the reference fuzz.py checks
+    # the tick engine against
+    params = calculate_parameters(dimensions, catalog)
     
-    main_rods_count, main_lengths, last_main_length, extra_main_needed = calculate_main_rods(
+    main_rods = calculate_main_rods(
         dimensions.length1,
         dimensions.length2,
         dimensions.width1,
-        dimensions.width2
+        dimensions.width2,
+        catalog
     )
-    cross_rods_count, cross_lengths, last_cross_length = calculate_cross_rods(
+    cross_rods = calculate_cross_rods(
         dimensions.length1,
         dimensions.length2,
         dimensions.width1,
-        dimensions.width2
+        dimensions.width2,
+        catalog
+    )
+    
+    l_patti = calculate_l_patti(
+        max(dimensions.width1, dimensions.width2), 
+        dimensions.linter_spacing,
+        main_rods[1],
+        catalog
+    )
+    
+    return build_calculation(
+        dimensions,
+        params,
+        main_rods,
+        cross_rods,
+        l_patti,
+        calculate_board_requirements(dimensions, catalog),
+        calculate_room_area(dimensions)
     )
+
+def build_calculation(
+    dimensions: RoomDimensions,
+    parameters: tuple[int, float],
+    main_rods: tuple[int, list[float], float, str],
+    cross_rods: tuple[int, list[float], float],
+    l_patti: tuple[int, int, int, float],
+    boards: tuple[float, float],
+    room_area: float
+) -> CeilingCalculation:
+    params_full, params_extra = parameters
+    main_rods_count, main_lengths, last_main_length, extra_main_needed = main_rods
+    cross_rods_count, cross_lengths, last_cross_length = cross_rods
+    full_l_patti, l_patti_cuts, remaining_cuts, cut_size = l_patti
+    board_count, board_extra_sqft = boards
     
     connecting_clips = main_rods_count * cross_rods_count
     
@@ -204,20 +246,11 @@ def calculate_ceiling_requirements(dimensions: RoomDimensions) -> CeilingCalcula
     
     screws = ceil(total_parameter_length) * 12
     
-    full_l_patti, l_patti_cuts, remaining_cuts, cut_size = calculate_l_patti(
-        max(dimensions.width1, dimensions.width2), 
-        dimensions.linter_spacing,
-        main_lengths
-    )
-    
     black_screws = l_patti_cuts * 2
     
     fasteners = l_patti_cuts
     fastener_clips = l_patti_cuts
     
-    board_count, board_extra_sqft = calculate_board_requirements(dimensions)
-    
-    room_area = calculate_room_area(dimensions)
     black_screw_boxes = ceil(room_area / 1000)
     
     cross_rods_length = sum(cross_lengths)